@@ -1,11 +1,10 @@
 from __future__ import print_function
 
-# Import modules from standard Python (>= 2.4) library
-import datetime, sys, io
-try:
-    import cPickle as pickle
-except ImportError:
-    import pickle
+# Import modules from standard Python library
+# NB pickle and io are imported lazily by dumps/loads below, so that the
+# (not so common) callers that need them pay for the import, rather than
+# everybody that imports this module.
+import collections, datetime, sys
 
 # Import third-party modules
 from .qt_compat import QtGui,QtCore,QtWidgets
@@ -14,86 +13,171 @@ from .qt_compat import QtGui,QtCore,QtWidgets
 from . import xmlstore,util,datatypes
 from .datatypes import unicode
 
+# Cache for find_global resolutions: unpickling a large store calls
+# find_global once per pickled class, and repeat lookups should be a
+# single dict hit rather than a sys.modules lookup plus getattr.
+_find_global_cache = {}
+
 def find_global(module,name):
-    import sys
-    return getattr(sys.modules[module],name)
+    key = (module,name)
+    cls = _find_global_cache.get(key)
+    if cls is None:
+        cls = getattr(sys.modules[module],name)
+        _find_global_cache[key] = cls
+    return cls
+
+# Unpickler class that resolves globals through find_global. It is created
+# on first use, so importing this module does not pay for the pickle import.
+_unpicklerclass = None
+
+def _getUnpicklerClass():
+    global _unpicklerclass
+    if _unpicklerclass is None:
+        import pickle
+        class _Unpickler(pickle.Unpickler):
+            """Unpickler that resolves globals through find_global.
+            (assigning to an Unpickler "find_global" attribute only worked with
+            the Python 2 cPickle module; on Python 3 find_class must be overridden.)
+            """
+            def find_class(self,module,name):
+                return find_global(module,name)
+        _unpicklerclass = _Unpickler
+    return _unpicklerclass
 
 def dumps(obj):
+    import io, pickle
     stream = io.BytesIO()
-    p = pickle.Pickler(stream,-1)
-    #setattr(p,'find_global',find_global)
+    p = pickle.Pickler(stream,pickle.HIGHEST_PROTOCOL)
+    # Disable memoization where the pickler supports it: this skips the
+    # per-object memo bookkeeping. Only safe because serialized TypedStore
+    # payloads are acyclic trees without shared subobjects.
+    try:
+        p.fast = True
+    except AttributeError:
+        pass
     p.dump(obj)
     return stream.getvalue()
 
-def loads(self,string):
-    stream = io.BytesIO(string)
-    p = pickle.Unpickler(stream)
-    setattr(p,'find_global',find_global)
-    return p.load()
+def loads(string):
+    import io
+    return _getUnpicklerClass()(io.BytesIO(string)).load()
+
+def _encode(value):
+    """Serializes a value for transport through a string-valued QVariant.
+    The C-coded marshal module handles the primitive types that editors
+    actually store (str, int, float, bool, bytes, None) and is several times
+    faster than pickle; any other type falls back to pickle.
+    """
+    import marshal
+    try:
+        return b'm'+marshal.dumps(value,2)
+    except ValueError:
+        return b'p'+dumps(value)
+
+def _decode(data):
+    """Counterpart of _encode: deserializes a value obtained from a
+    string-valued QVariant.
+    """
+    if data[:1]==b'm':
+        import marshal
+        return marshal.loads(data[1:])
+    import io
+    return _getUnpicklerClass()(io.BytesIO(data[1:])).load()
+
+# Whether to add a close button to windows: cannot change during the
+# lifetime of the process, so it is evaluated once at import.
+_NEED_CLOSE_BUTTON = sys.platform!='win32'
 
 def needCloseButton():
     """Whether to add a close button to Qt4 windows.
     On some platforms the window manager does not provide facilities for
     closing windows, so we have to add a close button to the dialogs.
     """
-    return sys.platform!='win32'
+    return _NEED_CLOSE_BUTTON
 
 # =======================================================================
 # Functionality for linking data types to editor classes, and adding
 # custom data types.
 # =======================================================================
 
-# This will hold the dictionary linking data type names to editor classes.
-# It is populated lazily, i.e., when the dictionary is first requested.
-editors = None
+# Dictionary linking data type names to editor classes. The entries for the
+# built-in data types are added at the bottom of this module, after the
+# editor classes have been defined; that removes the need for a lazy
+# initialization check on every request for the dictionary.
+editors = {}
 
 def getEditors():
     """Returns a dictionary linking data type names to editor classes.
     """
-    global editors
-    if editors is None:
-        editors = {'string'  :StringEditor,
-                   'int'     :IntEditor,
-                   'float'   :ScientificDoubleEditor,
-                   'bool'    :BoolEditor,
-                   'datetime':DateTimeEditor,
-                   'duration':DurationEditor,
-                   'color'   :ColorEditor}
     return editors
 
+# Cache for getEditor results, linking data type names to editor classes
+# (or _noeditor for types without one). getEditor is called for every cell
+# painted by the Qt delegates and for every edit going through
+# TypedStoreModel, so repeated lookups must be a single dict hit;
+# registerEditor clears the cache when the registry changes.
+_editor_cache = {}
+_noeditor = object()
+
+# Synthesized ArrayEditor subclasses, shared per element type. Creating a
+# class is far more expensive than creating an instance, so each distinct
+# array type gets exactly one class for the lifetime of the process.
+_arrayeditorclasses = {}
+
+def _getArrayEditorClass(name,basename,baseclass):
+    editorclass = _arrayeditorclasses.get(basename)
+    if editorclass is None:
+        valueclass = xmlstore.datatypes.get(name)
+        editorclass = type('Array'+baseclass.__name__,(ArrayEditor,),{'elementeditorclass':baseclass,'elementname':basename,'valueclass':valueclass})
+        _arrayeditorclasses[basename] = editorclass
+    return editorclass
+
 def getEditor(name):
+    editorclass = _editor_cache.get(name)
+    if editorclass is not None:
+        return None if editorclass is _noeditor else editorclass
     edts = getEditors()
-    if name not in edts and name.startswith('array(') and name.endswith(')'):
-        # This is an array data type. Build a suitable editor class on the spot.
+    # Fixed-length slice comparisons are slightly cheaper than the
+    # startswith/endswith method calls for recognizing array type names.
+    if name not in edts and name[:6]=='array(' and name[-1:]==')':
+        # This is an array data type. Look up (or synthesize) its editor class.
         basename = name[6:-1]
         baseclass = getEditor(basename)
         if baseclass is None: return None
-        valueclass = xmlstore.datatypes.get(name)
-        
-        # Create a new class for this array type and cache it for future use.
-        edts[name] = type('Array'+baseclass.__name__,(ArrayEditor,),{'elementeditorclass':baseclass,'elementname':basename,'valueclass':valueclass})
-    return edts.get(name,None)
+        edts[name] = _getArrayEditorClass(name,basename,baseclass)
+    editorclass = edts.get(name,None)
+    _editor_cache[name] = _noeditor if editorclass is None else editorclass
+    return editorclass
              
+# Local bindings for the debug checks in createEditor: a single LOAD_GLOBAL
+# rather than an attribute lookup chain per isinstance call.
+_Node = xmlstore.Node
+_QWidget = QtWidgets.QWidget
+
 def createEditor(node,parent=None,selectwithradio=False,**kwargs):
     """Returns an editor for the specified TypedStore node, as child of the supplied
     parent QWidget.
     """
-    assert isinstance(node,xmlstore.Node), 'First argument to createEditor must be of type node.'
-    assert parent is None or isinstance(parent,QtWidgets.QWidget), 'If a parent is supplied to createEditor, it must derive from QWidget.'
+    if __debug__:
+        assert isinstance(node,_Node), 'First argument to createEditor must be of type node.'
+        assert parent is None or isinstance(parent,_QWidget), 'If a parent is supplied to createEditor, it must derive from QWidget.'
     if 'editorclass' in kwargs:
         editorclass = kwargs.pop('editorclass')
     else:
         editorclass = getEditor(node.getValueType())
         assert editorclass is not None, 'No editor available for node of type "%s".' % node.getValueType()
         
-    if issubclass(editorclass,AbstractSelectEditor) or not node.templatenode.hasAttribute('hasoptions'):
+    # Cache the template node locally: hasAttribute is a relatively expensive
+    # call into the XML DOM, and we may need it twice.
+    templatenode = node.templatenode
+    if issubclass(editorclass,AbstractSelectEditor) or not templatenode.hasAttribute('hasoptions'):
         editor = editorclass(parent,node,**kwargs)
     else:
         if selectwithradio:
             editor = SelectEditorRadio(parent,node,**kwargs)
         else:
             lineedit = None
-            if node.templatenode.hasAttribute('editable'): lineedit = editorclass(parent,node,**kwargs)
+            if templatenode.hasAttribute('editable'): lineedit = editorclass(parent,node,**kwargs)
             assert lineedit is None or isinstance(lineedit,QtWidgets.QLineEdit), 'Editor class must derive from QLineEdit.'
             editor = SelectEditor(parent,node,lineedit=lineedit,**kwargs)
             
@@ -107,6 +191,7 @@ def registerEditor(typename,editorclass):
     """
     assert issubclass(editorclass,AbstractPropertyEditor), 'Custom data editors must derive from xmlstore.AbstractPropertyEditor.'
     getEditors()[typename] = editorclass
+    _editor_cache.clear()
 
 class AbstractPropertyEditor(object):
     """Abstract class for editing the value of a node in the TypedStore.
@@ -119,8 +204,18 @@ class AbstractPropertyEditor(object):
     control loses focus. A combobox might call it directly after the currently
     selected item changes.
     """
+    # Registered editing-finished callbacks: None if no callback has been
+    # registered (the common case), a single callable, or a tuple of
+    # callables. This avoids both a per-instance container allocation and
+    # iteration overhead in onPropertyEditingFinished, which runs on every
+    # edit/focus-out.
+    # NB __slots__ cannot be used to save the instance __dict__ here, because
+    # subclasses combine this class with Qt widget bases, whose instance
+    # lay-out conflicts with slot-based classes.
+    propertyEditingFinished_callbacks = None
+
     def __init__(self,parent,node):
-        self.propertyEditingFinished_callbacks = []
+        pass
 
     def setValue(self,value):
         pass
@@ -128,46 +223,150 @@ class AbstractPropertyEditor(object):
     def value(self):
         pass
 
+    def addPropertyEditingFinishedCallback(self,callback):
+        """Registers a callback that is called (with the value of the
+        "forceclose" option) whenever the user has finished editing the value.
+        """
+        cbs = self.propertyEditingFinished_callbacks
+        if cbs is None:
+            self.propertyEditingFinished_callbacks = callback
+        elif callable(cbs):
+            self.propertyEditingFinished_callbacks = (cbs,callback)
+        else:
+            self.propertyEditingFinished_callbacks = cbs+(callback,)
+
     def onPropertyEditingFinished(self,*args,**kwargs):
-        for callback in self.propertyEditingFinished_callbacks:
-            callback(kwargs.get('forceclose', False))
+        cbs = self.propertyEditingFinished_callbacks
+        if cbs is None: return
+        forceclose = kwargs.get('forceclose',False)
+        if callable(cbs):
+            cbs(forceclose)
+        else:
+            for callback in cbs:
+                callback(forceclose)
 
     # Optional (static) methods that classes should implement if the value can
     # be represented by a QtCore.QVariant object.
     @staticmethod
     def convertFromQVariant(value):
         #return value.toPyObject()
-        #return loads(value.toString())
+        #return _decode(value.toString())
         return value
 
     @staticmethod
     def convertToQVariant(value):
         #return QtCore.QVariant(value)
-        #return QtCore.QVariant(dumps(value))
+        #return QtCore.QVariant(_encode(value))
         return value
 
     @staticmethod
     def displayValue(delegate,painter,option,index):
-        QtWidgets.QItemDelegate.paint(delegate,painter,option,index)
-        
+        # Cell painting is dominated by text layout, which is redone for every
+        # cell on every repaint. Render each distinct cell once into a pixmap
+        # and blit that on subsequent repaints. The cache key includes
+        # everything QItemDelegate.paint bakes into the rendering: the
+        # displayed value, the per-cell font/color/check state roles (served
+        # by TypedStoreModel for e.g. the bold non-default highlight), the
+        # option font, palette, cell size and state. Entries for changed
+        # cells simply stop being hit and age out of the cache.
+        rect = option.rect
+        try:
+            cellfont = index.data(_FONTROLE)
+            if cellfont is not None: cellfont = cellfont.key()
+            cellcolor = index.data(_TEXTCOLORROLE)
+            if cellcolor is not None: cellcolor = cellcolor.rgba()
+            key = (index.data(QtCore.Qt.DisplayRole),cellfont,cellcolor,index.data(_CHECKSTATEROLE),option.font.key(),option.palette.cacheKey(),rect.width(),rect.height(),int(option.state))
+            qPixMap = _displaypixmaps.get(key)
+        except TypeError:
+            # Unhashable display value: paint directly. Building the key
+            # tuple never hashes its members; only the cache lookup does,
+            # so that must sit inside the try for this fallback to engage.
+            QtWidgets.QItemDelegate.paint(delegate,painter,option,index)
+            return
+        if qPixMap is None:
+            # Render the cell into a pixmap, honouring the device pixel ratio
+            # of the paint target where supported.
+            try:
+                dpr = painter.device().devicePixelRatioF()
+            except AttributeError:
+                dpr = 1
+            qPixMap = QtGui.QPixmap(int(rect.width()*dpr),int(rect.height()*dpr))
+            if dpr!=1: qPixMap.setDevicePixelRatio(dpr)
+            qPixMap.fill(QtCore.Qt.transparent)
+            p = QtGui.QPainter(qPixMap)
+            cellopt = QtWidgets.QStyleOptionViewItem(option)
+            cellopt.rect = QtCore.QRect(0,0,rect.width(),rect.height())
+            QtWidgets.QItemDelegate.paint(delegate,p,cellopt,index)
+            p.end()
+            if len(_displaypixmaps)>=_MAXDISPLAYPIXMAPS:
+                _displaypixmaps.popitem(last=False)
+            _displaypixmaps[key] = qPixMap
+        else:
+            _displaypixmaps.move_to_end(key)
+        painter.drawPixmap(rect.topLeft(),qPixMap)
+
+# Bounded (LRU) cache of rendered cell pixmaps, used by
+# AbstractPropertyEditor.displayValue.
+_displaypixmaps = collections.OrderedDict()
+_MAXDISPLAYPIXMAPS = 512
+
 # =======================================================================
 # Functions for converting between Qt date/time object and Python
 # datetime objects
 # =======================================================================
 
+# UTC time zone object, resolved once rather than per conversion: these
+# conversions run once per datetime cell during tree/table repaints.
+_UTC = datetime.timezone.utc
+
 def qtdatetime2datetime(qtdatetime):
     """Convert Qt QDateTime object to Python datetime object
     """
     qdt = qtdatetime.toUTC()
     d = qdt.date()
     t = qdt.time()
-    return datetime.datetime(d.year(),d.month(),d.day(),t.hour(),t.minute(),t.second(),tzinfo=util.getUTC())
+    return datetime.datetime(d.year(),d.month(),d.day(),t.hour(),t.minute(),t.second(),tzinfo=_UTC)
+
+_ZEROOFFSET = datetime.timedelta(0)
+
+# Qt constructors and the UTC time spec bound to module-level names: each
+# datetime2qtdatetime call then pays single global loads rather than
+# attribute lookups on the Qt modules. (Qt offers no QDateTime constructor
+# taking the date/time fields as integers, so the QDate/QTime intermediates
+# cannot be eliminated.)
+_QDate,_QTime,_QDateTime = QtCore.QDate,QtCore.QTime,QtCore.QDateTime
+_UTCSPEC = QtCore.Qt.UTC
+
+# Pre-bound item data roles and check states: item-model methods test
+# these on every Qt callback, and a module global is cheaper than the Qt
+# attribute chain.
+_DISPLAYROLE = QtCore.Qt.DisplayRole
+_EDITROLE = QtCore.Qt.EditRole
+_FONTROLE = QtCore.Qt.FontRole
+_TEXTCOLORROLE = QtCore.Qt.TextColorRole
+_CHECKSTATEROLE = QtCore.Qt.CheckStateRole
+_WHATSTHISROLE = QtCore.Qt.WhatsThisRole
+_CHECKED = QtCore.Qt.Checked
+_PARTIALLYCHECKED = QtCore.Qt.PartiallyChecked
+_UNCHECKED = QtCore.Qt.Unchecked
+
+# Pre-built colors used by TypedStoreModel.data: hidden nodes are shown
+# in blue, read-only values in grey. QColor is a plain value type, so the
+# same instance can be returned for every cell.
+_HIDDENCOLOR = QtGui.QColor(0,0,255)
+_READONLYCOLOR = QtGui.QColor(128,128,128)
 
 def datetime2qtdatetime(dt):
     """Convert Python datetime object to Qt QDateTime object.
     """
-    tm = dt.utctimetuple()
-    return QtCore.QDateTime(QtCore.QDate(tm.tm_year,tm.tm_mon,tm.tm_mday),QtCore.QTime(tm.tm_hour,tm.tm_min,tm.tm_sec),QtCore.Qt.UTC)
+    if dt.tzinfo is None or dt.utcoffset()==_ZEROOFFSET:
+        # Naive or already-UTC datetime (the common case): read the fields
+        # directly rather than building a time tuple via utctimetuple.
+        y,mo,d,h,mi,s = dt.year,dt.month,dt.day,dt.hour,dt.minute,dt.second
+    else:
+        tm = dt.utctimetuple()
+        y,mo,d,h,mi,s = tm[:6]
+    return _QDateTime(_QDate(y,mo,d),_QTime(h,mi,s),_UTCSPEC)
 
 # =======================================================================
 # Editors for built-in data types
@@ -188,13 +387,55 @@ class StringEditor(AbstractPropertyEditor,QtWidgets.QLineEdit):
         if value is None: value = ''
         QtWidgets.QLineEdit.setText(self,value)
 
-    @staticmethod
-    def convertFromQVariant(value):
-        return unicode(value)
-
-    @staticmethod
-    def convertToQVariant(value):
-        return unicode(value)
+    # The QVariant converters are bound directly to the unicode constructor:
+    # they are called per cell during table paints, and the direct binding
+    # avoids a Python wrapper frame per call.
+    convertFromQVariant = staticmethod(unicode)
+    convertToQVariant = staticmethod(unicode)
+
+def _getNumericBounds(templatenode):
+    """Returns the (minInclusive,maxInclusive) bounds declared on the given
+    template node, as floats (None where absent). The parsed bounds are
+    cached on the template node itself: template XML is immutable for the
+    lifetime of the document, while numeric editors are created per table
+    row, so the DOM attribute traversal should run only once per node.
+    """
+    bounds = getattr(templatenode,'_xmlstore_bounds_cache',None)
+    if bounds is None:
+        minimum,maximum = None,None
+        if templatenode.hasAttribute('minInclusive'): minimum = float(templatenode.getAttribute('minInclusive'))
+        if templatenode.hasAttribute('maxInclusive'): maximum = float(templatenode.getAttribute('maxInclusive'))
+        bounds = (minimum,maximum)
+        templatenode._xmlstore_bounds_cache = bounds
+    return bounds
+
+def _getNodeTraits(templatenode):
+    """Returns (canhavevalue,valuetype,readonly) for the given template
+    node. Like the numeric bounds above, the traits are cached on the
+    template node itself: they are pure functions of the immutable
+    template XML, yet the item-model callbacks need them on every paint,
+    edit and flags query Qt makes.
+    """
+    traits = getattr(templatenode,'_xmlstore_traits_cache',None)
+    if traits is None:
+        traits = (templatenode.hasAttribute('type'),templatenode.getAttribute('type'),templatenode.hasAttribute('readonly'))
+        templatenode._xmlstore_traits_cache = traits
+    return traits
+
+def _getOptionNodes(templatenode):
+    """Returns the option elements below the given template node. As with
+    the traits above, the located elements are cached on the immutable
+    template node: util.findDescendantNode(s) scans all child elements on
+    every call, and the What's-this text is queried per tooltip request.
+    """
+    optionnodes = getattr(templatenode,'_xmlstore_optionnodes_cache',None)
+    if optionnodes is None:
+        optionsroot = util.findDescendantNode(templatenode,['options'])
+        assert optionsroot is not None, 'Variable with "select" type lacks "options" element below.'
+        optionnodes = util.findDescendantNodes(optionsroot,['option'])
+        assert len(optionnodes)>0, 'Variable with "select" type does not have any options assigned to it.'
+        templatenode._xmlstore_optionnodes_cache = optionnodes
+    return optionnodes
 
 class IntEditor(AbstractPropertyEditor,QtWidgets.QSpinBox):
     """Editor for integer.
@@ -203,15 +444,9 @@ class IntEditor(AbstractPropertyEditor,QtWidgets.QSpinBox):
         QtWidgets.QSpinBox.__init__(self,parent)
         AbstractPropertyEditor.__init__(self,parent,node)
 
-        templatenode = node.templatenode
-        if templatenode.hasAttribute('minInclusive'):
-            self.setMinimum(int(templatenode.getAttribute('minInclusive')))
-        else:
-            self.setMinimum(-2147483648)
-        if templatenode.hasAttribute('maxInclusive'):
-            self.setMaximum(int(templatenode.getAttribute('maxInclusive')))
-        else:
-            self.setMaximum(2147483647)
+        minimum,maximum = _getNumericBounds(node.templatenode)
+        self.setMinimum(-2147483648 if minimum is None else int(minimum))
+        self.setMaximum( 2147483647 if maximum is None else int(maximum))
         if kwargs.get('unitinside',False):
             unit = node.getUnit()
             if unit is not None: self.setSuffix(' '+unit)
@@ -225,51 +460,74 @@ class IntEditor(AbstractPropertyEditor,QtWidgets.QSpinBox):
     def setValue(self,value):
         if value is not None: QtWidgets.QSpinBox.setValue(self,value)
 
-    @staticmethod
-    def convertFromQVariant(value):
-        return int(val)
-
-    @staticmethod
-    def convertToQVariant(value):
-        return int(value)
+    # Bound directly to the int constructor (see StringEditor); this also
+    # fixes the old convertFromQVariant body, which referenced an undefined
+    # name and raised NameError whenever it was called.
+    convertFromQVariant = staticmethod(int)
+    convertToQVariant = staticmethod(int)
 
 class AbstractSelectEditor(AbstractPropertyEditor):
     def __init__(self,parent,node):
         AbstractPropertyEditor.__init__(self,parent,node)
         self.node = node
+        self._options = None
+        self._optionsnovalue = None
+        self._valuetoindex = None
+
+    def _getParsedOptions(self):
+        """Returns the list of enabled options as (index,label,description,value)
+        tuples, with the value parsed from its XML representation. The list is
+        built on first use by walking the <options> element exactly once;
+        getOptions, valueFromIndex and indexFromValue all reuse it afterwards,
+        instead of re-traversing the template XML per call. The parsed list
+        is additionally cached on the template node itself, which is
+        immutable for the lifetime of the document, so all editors bound to
+        the same node (e.g. a combobox plus a radio button group) share a
+        single parse.
+        """
+        if self._options is None:
+            templatenode = self.node.templatenode
+            cache = getattr(templatenode,'_xmlstore_options_cache',None)
+            if cache is None:
+                options = util.findDescendantNode(templatenode,['options'])
+                assert options is not None, 'Node %s lacks "options" childnode.' % self.node
+                valueclass = self.node.getValueType(returnclass=True)
+                cache = []
+                ichild = 0
+                for ch in options.childNodes:
+                    if ch.nodeType==ch.ELEMENT_NODE and ch.localName=='option' and ch.getAttribute('disabled')!='True':
+                        label = ch.getAttribute('label')
+                        if label=='': label = ch.getAttribute('value')
+                        value = valueclass.fromXmlString(ch.getAttribute('value'),{},templatenode)
+                        cache.append((ichild,label,ch.getAttribute('description'),value))
+                        ichild += 1
+                templatenode._xmlstore_options_cache = cache
+            self._options = cache
+        return self._options
 
     def getOptions(self):
-        options = util.findDescendantNode(self.node.templatenode,['options'])
-        assert options is not None, 'Node %s lacks "options" childnode.' % node
-        children = []
-        ichild = 0
-        for ch in options.childNodes:
-            if ch.nodeType==ch.ELEMENT_NODE and ch.localName=='option' and ch.getAttribute('disabled')!='True':
-                label = ch.getAttribute('label')
-                if label=='': label = ch.getAttribute('value')
-                children.append((ichild,label,ch.getAttribute('description')))
-                ichild += 1
-        return children
+        if self._optionsnovalue is None:
+            self._optionsnovalue = [(ichild,label,description) for ichild,label,description,value in self._getParsedOptions()]
+        return self._optionsnovalue
 
     def valueFromIndex(self,index):
-        ichild = 0
-        options = util.findDescendantNode(self.node.templatenode,['options'])
-        for ch in options.childNodes:
-            if ch.nodeType==ch.ELEMENT_NODE and ch.localName=='option' and ch.getAttribute('disabled')!='True':
-                if ichild==index:
-                    return self.node.getValueType(returnclass=True).fromXmlString(ch.getAttribute('value'),{},self.node.templatenode)
-                ichild += 1
-        return None
+        options = self._getParsedOptions()
+        if index<0 or index>=len(options): return None
+        return options[index][3]
 
     def indexFromValue(self,value):
         if value is None: return 0
-        ichild = 0
-        options = util.findDescendantNode(self.node.templatenode,['options'])
-        for ch in options.childNodes:
-            if ch.nodeType==ch.ELEMENT_NODE and ch.localName=='option' and ch.getAttribute('disabled')!='True':
-                chvalue = self.node.getValueType(returnclass=True).fromXmlString(ch.getAttribute('value'),{},self.node.templatenode)
-                if value==chvalue: return ichild
-                ichild += 1
+        if self._valuetoindex is None:
+            try:
+                self._valuetoindex = dict([(v,i) for i,l,d,v in self._getParsedOptions()])
+            except TypeError:
+                # Unhashable value type: fall back to a linear scan over the
+                # (already parsed) option values.
+                self._valuetoindex = False
+        if self._valuetoindex is not False:
+            return self._valuetoindex.get(value)
+        for ichild,label,description,chvalue in self._getParsedOptions():
+            if value==chvalue: return ichild
         return None
 
 class SelectEditor(AbstractSelectEditor,QtWidgets.QComboBox):
@@ -282,12 +540,35 @@ class SelectEditor(AbstractSelectEditor,QtWidgets.QComboBox):
         if lineedit is not None:
             self.setEditable(True)
             self.setLineEdit(lineedit)
-        self.populate(node)
+        # Filling the combobox is deferred until the user actually opens the
+        # drop-down; until then it holds only the currently selected option.
+        # For long option lists population dominates dialog show time, while
+        # most editors are never dropped down.
+        self.populated = False
         self.currentIndexChanged.connect(self.onPropertyEditingFinished)
 
-    def populate(self,node):
-        for ichild,label,description in self.getOptions():
-            self.addItem(label,ichild)
+    def populate(self,node=None):
+        if self.populated: return
+        curchild = None
+        if self.count()>0: curchild = self.itemData(self.currentIndex())
+        options = self.getOptions()
+        self.blockSignals(True)
+        self.clear()
+        # Insert all labels with a single call (one model insert and view
+        # relayout, rather than one per item as with repeated addItem), then
+        # attach the option indices as item data.
+        self.insertItems(0,[option[1] for option in options])
+        icurrent = 0
+        for i,(ichild,label,description) in enumerate(options):
+            self.setItemData(i,ichild)
+            if ichild==curchild: icurrent = i
+        self.setCurrentIndex(icurrent)
+        self.blockSignals(False)
+        self.populated = True
+
+    def showPopup(self):
+        self.populate()
+        QtWidgets.QComboBox.showPopup(self)
 
     def value(self):
         icurrentindex = self.currentIndex()
@@ -303,11 +584,27 @@ class SelectEditor(AbstractSelectEditor,QtWidgets.QComboBox):
         ichild = self.indexFromValue(value)
         if ichild is None and self.isEditable():
             self.lineedit.setValue(value)
-        else:
+        elif self.populated:
             if ichild is None: ichild = 0
             self.setCurrentIndex(ichild)
+        else:
+            # Not populated yet: insert the selected option only.
+            if ichild is None: ichild = 0
+            options = self.getOptions()
+            self.blockSignals(True)
+            self.clear()
+            if options: self.addItem(options[ichild][1],ichild)
+            self.setCurrentIndex(0)
+            self.blockSignals(False)
 
 class SimpleSelectEditor(SelectEditor):
+    # Option values (and a value-to-index dict for fast reverse lookups),
+    # built by getOptions. None until that has happened: with deferred
+    # combobox population, valueFromIndex/indexFromValue can run before the
+    # options have been enumerated.
+    list = None
+    listindex = None
+
     def getOptionList(self):
         return ()
 
@@ -316,21 +613,23 @@ class SimpleSelectEditor(SelectEditor):
         if isinstance(info,dict):
             # A dictionary linking values to descriptions was returned
             self.list = list(sorted(info.keys(),key=str.lower))
-            return [(i,info[opt],'') for i,opt in enumerate(self.list)]
+            res = [(i,info[opt],'') for i,opt in enumerate(self.list)]
         else:
             # A list of values was returned
             self.list = info
-            return [(i,opt,'') for i,opt in enumerate(self.list)]
+            res = [(i,opt,'') for i,opt in enumerate(self.list)]
+        self.listindex = dict([(opt,i) for i,opt in enumerate(self.list)])
+        return res
 
     def valueFromIndex(self,index):
+        if self.list is None: self.getOptions()
         if index<0 or index>=len(self.list): return None
         return self.list[index]
 
     def indexFromValue(self,value):
         if value is None: return 0
-        for i,opt in enumerate(self.list):
-            if opt==value: return i
-        return None
+        if self.listindex is None: self.getOptions()
+        return self.listindex.get(value)
 
 class SelectEditorRadio(AbstractSelectEditor,QtWidgets.QButtonGroup):
     def __init__(self,parent,node,**kwargs):
@@ -365,24 +664,22 @@ class BoolEditor(AbstractPropertyEditor,QtWidgets.QComboBox):
         self.addItem('No', False)
         self.currentIndexChanged.connect(self.onPropertyEditingFinished)
 
+    # Item values by combobox index ("Yes" is added first, "No" second).
+    # Indexing this tuple avoids the itemData call into Qt per value query,
+    # and setValue needs no scan over the items at all.
+    indexvalues = (True,False)
+
     def value(self):
-        return bool(self.itemData(self.currentIndex()))
+        return self.indexvalues[self.currentIndex()]
 
     def setValue(self,value):
-        if value is None: value = True
-        for ioption in range(self.count()):
-            optionvalue = bool(self.itemData(ioption))
-            if optionvalue==value:
-                self.setCurrentIndex(ioption)
-                break
-
-    @staticmethod
-    def convertFromQVariant(value):
-        return bool(value)
+        # A missing value (None) defaults to True, which sits at index 0.
+        self.setCurrentIndex(0 if (value is None or value) else 1)
 
-    @staticmethod
-    def convertToQVariant(value):
-        return bool(value)
+    # Bound directly to the bool constructor to avoid a wrapper frame per
+    # converted cell (see StringEditor).
+    convertFromQVariant = staticmethod(bool)
+    convertToQVariant = staticmethod(bool)
 
 class DateTimeEditor(AbstractPropertyEditor,QtWidgets.QDateTimeEdit):
     """Editor for a datetime object.
@@ -454,26 +751,19 @@ class DurationEditor(AbstractPropertyEditor,QtWidgets.QWidget):
             self.comboUnits.setCurrentIndex(0)
             self.spinValue.setValue(seconds)
 
+    # Per-unit conversion factors to seconds (None = interpret value as days)
+    # and spin box maxima, indexed by the unit combobox index.
+    unit2seconds = (1.,60.,3600.,None)
+    unit2maximum = (60.,60.,24.,3650.)
+
     def value(self):
-        unit = self.comboUnits.currentIndex()
-        if   unit==0:
-            return datatypes.TimeDelta(seconds=self.spinValue.value())
-        elif unit==1:
-            return datatypes.TimeDelta(seconds=self.spinValue.value()*60)
-        elif unit==2:
-            return datatypes.TimeDelta(seconds=self.spinValue.value()*3600)
-        elif unit==3:
+        factor = self.unit2seconds[self.comboUnits.currentIndex()]
+        if factor is None:
             return datatypes.TimeDelta(days=self.spinValue.value())
+        return datatypes.TimeDelta(seconds=self.spinValue.value()*factor)
 
     def onUnitChange(self,unit):
-        if   unit==0:
-            self.spinValue.setMaximum(60.)
-        elif unit==1:
-            self.spinValue.setMaximum(60.)
-        elif unit==2:
-            self.spinValue.setMaximum(24.)
-        elif unit==3:
-            self.spinValue.setMaximum(3650.)
+        self.spinValue.setMaximum(self.unit2maximum[unit])
         self.onPropertyEditingFinished()
 
     @staticmethod
@@ -498,20 +788,29 @@ class ScientificDoubleValidator(QtGui.QValidator):
         self.maximum = None
         self.suffix = ''
 
+    # The characters that can occur in a valid value. Checking membership
+    # with frozenset.issuperset is a single C-level pass over the string,
+    # cheaper than a regular expression for these short numeric inputs.
+    validcharacters = frozenset('0123456789-+eE,.')
+
     def validate(self,input,pos):
         assert isinstance(input, (str, u''.__class__)),'input argument is not a string (old PyQt4 API?)'
 
         # Check for suffix (if ok, cut it off for further value checking)
-        if not input.endswith(self.suffix): return (QtGui.QValidator.Invalid,input,pos)
-        vallength = len(input)-len(self.suffix)
+        suffix = self.suffix
+        if suffix:
+            if not input.endswith(suffix): return (QtGui.QValidator.Invalid,input,pos)
+            value = input[:len(input)-len(suffix)]
+        else:
+            value = input
 
         # Check for invalid characters
-        rx = QtCore.QRegExp('[^\d\-+eE,.]')
-        if rx.indexIn(input[:vallength])!=-1: return (QtGui.QValidator.Invalid,input,pos)
+        if not self.validcharacters.issuperset(value): return (QtGui.QValidator.Invalid,input,pos)
 
         # Check if we can convert it into a floating point value
+        if not value: return (QtGui.QValidator.Intermediate,input,pos)
         try:
-            v = float(input[:vallength])
+            v = float(value)
         except ValueError:
             return (QtGui.QValidator.Intermediate,input,pos)
 
@@ -523,20 +822,40 @@ class ScientificDoubleValidator(QtGui.QValidator):
 
     def fixup(self,input):
         assert isinstance(input, (str, u''.__class__)),'input argument is not a string (old PyQt4 API?)'
-        if not input.endswith(self.suffix): return input
+        suffix = self.suffix
+        if not input.endswith(suffix): return input
 
+        value = input
+        if suffix: value = input[:len(input)-len(suffix)]
         try:
-            v = float(input[:len(input)-len(self.suffix)])
+            v = float(value)
         except ValueError:
             return input
 
-        if self.minimum is not None and v<self.minimum: input = u'%s%s' % (self.minimum,self.suffix)
-        if self.maximum is not None and v>self.maximum: input = u'%s%s' % (self.maximum,self.suffix)
+        if self.minimum is not None and v<self.minimum: input = u'%s%s' % (self.minimum,suffix)
+        if self.maximum is not None and v>self.maximum: input = u'%s%s' % (self.maximum,suffix)
         return input
 
     def setSuffix(self,suffix):
         self.suffix = suffix
 
+# Shared ScientificDoubleValidator instances, keyed by (minimum,maximum,
+# suffix). Validators are invoked read-only by Qt, so all editors with the
+# same bounds and suffix can use a single instance; editors switch validator
+# (copy-on-write) when their bounds or suffix change.
+_validatorcache = {}
+
+def _getScientificValidator(minimum,maximum,suffix):
+    key = (minimum,maximum,suffix)
+    validator = _validatorcache.get(key)
+    if validator is None:
+        validator = ScientificDoubleValidator()
+        validator.minimum = minimum
+        validator.maximum = maximum
+        validator.suffix = suffix
+        _validatorcache[key] = validator
+    return validator
+
 class ScientificDoubleEditor(AbstractPropertyEditor,QtWidgets.QLineEdit):
     """Editor for a floating point value.
     """
@@ -544,30 +863,36 @@ class ScientificDoubleEditor(AbstractPropertyEditor,QtWidgets.QLineEdit):
         QtWidgets.QLineEdit.__init__(self,parent)
         AbstractPropertyEditor.__init__(self, parent, node)
 
-        self.curvalidator = ScientificDoubleValidator(self)
+        minimum,maximum = None,None
+        if node is not None:
+            minimum,maximum = _getNumericBounds(node.templatenode)
+        self.curvalidator = _getScientificValidator(minimum,maximum,'')
         self.setValidator(self.curvalidator)
         self.suffix = ''
         self.editingFinished.connect(self.onPropertyEditingFinished)
 
-        if node is not None:
-            templatenode = node.templatenode        
-            if templatenode.hasAttribute('minInclusive'):
-                self.setMinimum(float(templatenode.getAttribute('minInclusive')))
-            if templatenode.hasAttribute('maxInclusive'):
-                self.setMaximum(float(templatenode.getAttribute('maxInclusive')))
-            if kwargs.get('unitinside',False):
-                unit = node.getUnit()
-                if unit is not None: self.setSuffix(' '+unit)
+        if node is not None and kwargs.get('unitinside',False):
+            unit = node.getUnit()
+            if unit is not None: self.setSuffix(' '+unit)
+
+    def _setValidatorState(self,minimum,maximum,suffix):
+        validator = _getScientificValidator(minimum,maximum,suffix)
+        if validator is not self.curvalidator:
+            self.curvalidator = validator
+            self.setValidator(validator)
 
     def setSuffix(self,suffix):
         value = self.value()
         self.suffix = suffix
-        self.curvalidator.setSuffix(suffix)
+        cur = self.curvalidator
+        self._setValidatorState(cur.minimum,cur.maximum,suffix)
         self.setValue(value)
 
     def value(self):
         text = self.text()
-        text = text[:len(text)-len(self.suffix)]
+        # Most editors have no suffix: skip the string copy in that case.
+        suffix = self.suffix
+        if suffix: text = text[:len(text)-len(suffix)]
         if text=='': return 0
         return float(text)
 
@@ -589,10 +914,12 @@ class ScientificDoubleEditor(AbstractPropertyEditor,QtWidgets.QLineEdit):
         QtWidgets.QLineEdit.setSelection(self,0,len(self.text())-len(self.suffix))
 
     def setMinimum(self,minimum):
-        self.curvalidator.minimum = minimum
+        cur = self.curvalidator
+        self._setValidatorState(minimum,cur.maximum,cur.suffix)
 
     def setMaximum(self,maximum):
-        self.curvalidator.maximum = maximum
+        cur = self.curvalidator
+        self._setValidatorState(cur.minimum,maximum,cur.suffix)
 
     def interpretText(self):
         if not self.hasAcceptableInput():
@@ -601,13 +928,11 @@ class ScientificDoubleEditor(AbstractPropertyEditor,QtWidgets.QLineEdit):
             if textnew is None: textnew = text
             self.setText(textnew)
 
-    @staticmethod
-    def convertFromQVariant(value):
-        return float(val)
-
-    @staticmethod
-    def convertToQVariant(value):
-        return float(value)
+    # Bound directly to the float constructor (see StringEditor); this also
+    # fixes the old convertFromQVariant body, which referenced an undefined
+    # name and raised NameError whenever it was called.
+    convertFromQVariant = staticmethod(float)
+    convertToQVariant = staticmethod(float)
 
 class ColorEditor(AbstractPropertyEditor,QtWidgets.QComboBox):
     """Editor for a color. Allows selection from a list of predefined colors,
@@ -619,16 +944,87 @@ class ColorEditor(AbstractPropertyEditor,QtWidgets.QComboBox):
 
         self.activated.connect(self.onActivated)
         self.allownone = (node is not None and node.templatenode.getAttribute('allownone')) or (node is None and kwargs.get('allownone',False))
+        # Filling the combobox with the full named-color list is deferred to
+        # the first time the drop-down is opened; until then it holds only
+        # the "none" option (if allowed), the current color and the custom
+        # entry. Editors that are never opened thus skip ~150 item inserts.
+        self.populated = False
         if self.allownone:
             # add none option
             self.addColor('none')
-        for cn in QtGui.QColor.colorNames():
-            c = QtGui.QColor(cn)
-            if c.alpha()<255: continue
-            self.addColor(cn,c)
         self.addColor('custom...',QtGui.QColor(255,255,255))
+        self._rebuildColorIndex()
         self.currentIndexChanged.connect(self.onPropertyEditingFinished)
 
+    def _rebuildColorIndex(self):
+        """(Re)builds the dict mapping packed (r<<16|g<<8|b) color values to
+        item indices, used by setValue to find a color without constructing a
+        QColor per item. The final "custom..." item is excluded, as are items
+        without a color (the "none" option).
+        """
+        rgb2index = {}
+        for i in range(self.count()-1):
+            c = self.itemData(i)
+            if c is not None:
+                rgb2index.setdefault((c.red()<<16)|(c.green()<<8)|c.blue(),i)
+        self.rgb2index = rgb2index
+
+    def populate(self):
+        if self.populated: return
+        curcolor = self.itemData(self.currentIndex())
+        self.blockSignals(True)
+        # Remove any single-color placeholder item inserted by setValue
+        # (everything between the optional "none" entry and "custom...").
+        ifirst = 1 if self.allownone else 0
+        for i in range(self.count()-2,ifirst-1,-1):
+            self.removeItem(i)
+        # Insert the full named color list before the final "custom..." entry.
+        insertpos = self.count()-1
+        for cn,c,icon in self.getColorItems(self.iconSize()):
+            self.insertItem(insertpos,icon,cn,c)
+            insertpos += 1
+        self.populated = True
+        self._rebuildColorIndex()
+        # Remap the current selection onto the freshly inserted items.
+        if curcolor is not None:
+            self.setValue(self.convertFromQVariant(curcolor))
+        self.blockSignals(False)
+
+    def showPopup(self):
+        self.populate()
+        QtWidgets.QComboBox.showPopup(self)
+
+    # Named colors (fully opaque ones only) and the per-icon-size list of
+    # ready-made icons, shared across all ColorEditor instances. Building the
+    # ~150 color swatch pixmaps is by far the most expensive part of creating
+    # an editor, so it is done only once per icon size.
+    namedcolors = None
+    iconcache = None
+
+    @classmethod
+    def getNamedColors(cls):
+        if cls.namedcolors is None:
+            namedcolors = []
+            for cn in QtGui.QColor.colorNames():
+                c = QtGui.QColor(cn)
+                if c.alpha()<255: continue
+                namedcolors.append((cn,c))
+            cls.namedcolors = namedcolors
+        return cls.namedcolors
+
+    @classmethod
+    def getColorItems(cls,iconsize):
+        if cls.iconcache is None: cls.iconcache = {}
+        key = (iconsize.width(),iconsize.height())
+        items = cls.iconcache.get(key)
+        if items is None:
+            items = []
+            for cn,c in cls.getNamedColors():
+                qPixMap = cls.createPixmap(c,key[0]-2,key[1]-2)
+                items.append((cn,c,QtGui.QIcon(qPixMap)))
+            cls.iconcache[key] = items
+        return items
+
     def setValue(self,value):
         if not value.isValid():
             assert self.allownone, 'An value of none was specified, but this color must have a value.'
@@ -638,12 +1034,23 @@ class ColorEditor(AbstractPropertyEditor,QtWidgets.QComboBox):
         # If the value is missing, default to white
         if value is None: value = datatypes.Color(255,255,255)
 
-        qcolor = QtGui.QColor(value.red,value.green,value.blue)
-        for i in range(self.count()-1):
-            if QtGui.QColor(self.itemData(i))==qcolor:
-                self.setCurrentIndex(i)
-                break
+        key = (value.red<<16)|(value.green<<8)|value.blue
+        i = self.rgb2index.get(key)
+        if i is not None:
+            self.setCurrentIndex(i)
         else:
+            qcolor = QtGui.QColor(value.red,value.green,value.blue)
+            if not self.populated:
+                name = self.valueToString(value)
+                if name!='custom':
+                    # Not populated yet: insert this (named) color as a
+                    # placeholder item just before the "custom..." entry.
+                    index = self.count()-1
+                    self.insertItem(index,name)
+                    self.setItemColor(index,qcolor)
+                    self.rgb2index[key] = index
+                    self.setCurrentIndex(index)
+                    return
             index = self.count()-1
             self.setItemColor(index,qcolor)
             self.setCurrentIndex(index)
@@ -684,6 +1091,21 @@ class ColorEditor(AbstractPropertyEditor,QtWidgets.QComboBox):
 
         return qPixMap
 
+    # Cache of rendered color swatches, keyed by packed 24-bit color value
+    # and pixmap size. Built lazily; displayValue consults it on every cell
+    # paint, so cached colors skip the QPixmap+QPainter path entirely.
+    pixmapcache = None
+
+    @classmethod
+    def getPixmap(cls,color,width,height):
+        if cls.pixmapcache is None: cls.pixmapcache = {}
+        key = ((color.red()<<16)|(color.green()<<8)|color.blue(),width,height)
+        qPixMap = cls.pixmapcache.get(key)
+        if qPixMap is None:
+            qPixMap = cls.createPixmap(color,width,height)
+            cls.pixmapcache[key] = qPixMap
+        return qPixMap
+
     @staticmethod
     def convertFromQVariant(value):
         if value is None: return datatypes.Color()
@@ -708,24 +1130,26 @@ class ColorEditor(AbstractPropertyEditor,QtWidgets.QComboBox):
         rect = option.rect.adjusted(xOffset,yOffset,-xOffset,-yOffset)
         rect.setWidth(rect.height())
 
-        qPixMap = ColorEditor.createPixmap(value,rect.width(),rect.height())
+        qPixMap = ColorEditor.getPixmap(value,rect.width(),rect.height())
         option.decorationAlignment = QtCore.Qt.AlignLeft|QtCore.Qt.AlignVCenter
         delegate.drawBackground(painter,option,index)
         delegate.drawDecoration(painter,option,rect,qPixMap)
         delegate.drawFocus(painter,option,option.rect)
 
+    # Dictionary mapping 24-bit packed (r<<16|g<<8|b) color values to names.
+    # A packed integer key is cheaper to build and hash per lookup than a
+    # 3-tuple of component integers.
     color2name = None
     @staticmethod
     def valueToString(value):
         if value.red is None or value.green is None or value.blue is None: return 'none'
-        if ColorEditor.color2name is None:
-            ColorEditor.color2name = {}
-            for cn in reversed(QtGui.QColor.colorNames()):
-                c = QtGui.QColor(cn)
-                if c.alpha()<255: continue
-                ColorEditor.color2name[(c.red(),c.green(),c.blue())] = cn
-        coltup = (value.red,value.green,value.blue)
-        return ColorEditor.color2name.get(coltup,'custom')
+        color2name = ColorEditor.color2name
+        if color2name is None:
+            color2name = {}
+            for cn,c in reversed(ColorEditor.getNamedColors()):
+                color2name[(c.red()<<16)|(c.green()<<8)|c.blue()] = cn
+            ColorEditor.color2name = color2name
+        return color2name.get((value.red<<16)|(value.green<<8)|value.blue,'custom')
 
 class PrivateWindowEditor(AbstractPropertyEditor,QtWidgets.QWidget):
     def __init__(self,node,editor,parent=None):
@@ -774,6 +1198,14 @@ class StringWithImageEditor(AbstractPropertyEditor,QtWidgets.QComboBox):
         def __init__(self,parent):
             QtCore.QAbstractListModel.__init__(self,parent)
             self.owner = parent
+            # Cache the owner properties plus per-name pixmaps and labels
+            # used by data(): it runs for every visible row on every paint
+            # cycle, and logicalDpiX in particular is a call into Qt.
+            self.width = parent.width
+            self.height = parent.height
+            self.dpi = parent.logicalDpiX()
+            self.pixmaps = {}
+            self.labels = {}
 
         def rowCount(self,parent):
             if parent.isValid(): return 0
@@ -783,10 +1215,16 @@ class StringWithImageEditor(AbstractPropertyEditor,QtWidgets.QComboBox):
             irow = index.row()
             name = self.owner.items[irow]
             if role==QtCore.Qt.DecorationRole:
-                pixmap = self.owner.getPixMap(name,self.owner.width,self.owner.height,self.owner.logicalDpiX())
+                pixmap = self.pixmaps.get(name)
+                if pixmap is None:
+                    pixmap = self.owner.getPixMap(name,self.width,self.height,self.dpi)
+                    self.pixmaps[name] = pixmap
                 if pixmap: return pixmap
             elif role==QtCore.Qt.DisplayRole:
-                label = self.owner.getLabel(name)
+                label = self.labels.get(name)
+                if label is None:
+                    label = self.owner.getLabel(name)
+                    self.labels[name] = label
                 if label: return label
             elif role==QtCore.Qt.EditRole:
                 return name
@@ -817,13 +1255,20 @@ class StringWithImageEditor(AbstractPropertyEditor,QtWidgets.QComboBox):
                 self.setCurrentIndex(i)
                 break
 
+    # Cache of rendered pixmaps, keyed by (value,width,height,dpi). Keying on
+    # the size and resolution lets entries for different icon sizes/screens
+    # coexist, rather than evicting each other on every lookup in multi-DPI
+    # set-ups. Each subclass lazily gets its own cache dictionary.
+    cache = None
+
     @classmethod
     def getPixMap(cls,value,width,height,dpi):
-        if not hasattr(cls,'cache'): cls.cache = {}
-        qPixMap = cls.cache.get(value,None)
-        if qPixMap is None or qPixMap.width()!=width or qPixMap.height()!=height:
+        if cls.cache is None: cls.cache = {}
+        key = (value,width,height,dpi)
+        qPixMap = cls.cache.get(key)
+        if qPixMap is None:
             qPixMap = cls.createPixMap(value,width,height,dpi)
-            cls.cache[value] = qPixMap
+            cls.cache[key] = qPixMap
         return qPixMap
 
     @classmethod
@@ -888,7 +1333,7 @@ class PropertyDelegate(QtWidgets.QItemDelegate):
 
         # Install event filter that captures key events for view from the editor (e.g. return press).
         editor.installEventFilter(self)
-        editor.propertyEditingFinished_callbacks.append(self.editingFinished)
+        editor.addPropertyEditingFinishedCallback(self.editingFinished)
 
         return editor
 
@@ -933,9 +1378,11 @@ class PropertyDelegate(QtWidgets.QItemDelegate):
         # Below we clean up the editor ourselves. Qt would normally take
         # care of that, but for our own editors that live partially in
         # Python the Qt4/PyQt4 destructor fails to call the Python destroy.
-        # That would disable clean-up, so we do it here explicitly.
+        # Schedule deletion through the event loop rather than destroying
+        # synchronously inside the commit callback, so Qt can batch the
+        # resulting relayouts.
         editor.hide()
-        editor.destroy()
+        editor.deleteLater()
 
 class ArrayEditor(AbstractPropertyEditor,QtWidgets.QTableView):
     separate = True
@@ -950,11 +1397,46 @@ class ArrayEditor(AbstractPropertyEditor,QtWidgets.QTableView):
         When we can safely expect the user base to use PyQt4 >=4.5, we can insert
         the overridden methods in this class into the original PropertyDelegate.
         """
-        
+
+        def __init__(self,parent=None,**kwargs):
+            PropertyDelegate.__init__(self,parent,**kwargs)
+            # Pool of editor widgets available for reuse. Every cell in the
+            # array shares the same node and editor class, so an editor
+            # committed for one cell can simply be handed out again for the
+            # next, skipping widget construction, layout setup, event
+            # filter installation and callback registration. (This would
+            # not be safe in PropertyDelegate itself, where editors bake
+            # node-specific configuration in at construction.)
+            self._editorpool = []
+
+            # Bind the editor class methods once: every paint and edit goes
+            # through them, and the dict plus attribute lookup per call
+            # adds up while scrolling.
+            editorclass = self.properties['editorclass']
+            self._convertFromQVariant = editorclass.convertFromQVariant
+            self._convertToQVariant = editorclass.convertToQVariant
+            self._displayValue = editorclass.displayValue
+
+        def createEditor(self, parent, option, index):
+            if self._editorpool:
+                # Recycled editors keep their event filter and their
+                # editing-finished callback from first construction; only
+                # reparenting is needed, so neither gets registered twice.
+                editor = self._editorpool.pop()
+                editor.setParent(parent)
+                return editor
+            return PropertyDelegate.createEditor(self,parent,option,index)
+
+        def destroyEditor(self, editor, index=None):
+            # Qt 5 deletes closed editors via deleteLater by default; skip
+            # that for editors that went back into the pool.
+            if editor not in self._editorpool:
+                PropertyDelegate.destroyEditor(self,editor,index)
+
         def setEditorData(self, editor,index):
             value = index.data(QtCore.Qt.EditRole)
             if value.isValid():
-                value = self.properties['editorclass'].convertFromQVariant(value)
+                value = self._convertFromQVariant(value)
             else:
                 value = None
             editor.setValue(value)
@@ -963,38 +1445,110 @@ class ArrayEditor(AbstractPropertyEditor,QtWidgets.QTableView):
         def setModelData(self, editor, model, index):
             value = editor.value()
             if value is not None:
-                value = self.properties['editorclass'].convertToQVariant(value)
+                value = self._convertToQVariant(value)
             model.setData(index,value)
             if isinstance(value,util.referencedobject): value.release()
-                
-            # Below we clean up the editor ourselves. Qt would normally take
-            # care of that, but for our own editors that live partially in
-            # Python the Qt4/PyQt4 destructor fails to call the Python destroy.
-            # That would disable clean-up, so we do it here explicitly.
+
+            # Return the editor to the pool for the next cell edit, rather
+            # than destroying it.
             editor.hide()
-            editor.destroy()      
+            editor.setParent(None)
+            self._editorpool.append(editor)
 
         def paint(self,painter,option,index):
-            self.properties['editorclass'].displayValue(self,painter,option,index)
+            # The editor class paints the cell itself; via the rendered
+            # pixmap cache in AbstractPropertyEditor.displayValue this costs
+            # a single data() call per cell, so there is no need to bundle
+            # multiple paint roles into one custom-role query.
+            self._displayValue(self,painter,option,index)
         
     class Model(QtCore.QAbstractItemModel):
         def __init__(self,shape,data,node,editorclass):
             QtCore.QAbstractItemModel.__init__(self)
             if data is None: data = []
-            def convert(arr):
-                res = []
-                for e in arr:
-                    if isinstance(e,(list,tuple)):
-                        e = convert(e)
-                    elif e is xmlstore.datatypes.DataTypeArray.empty:
-                        e = None
-                    res.append(e)
-                return res
             self.shape = shape
-            self.arraydata = convert(data)
+
+            # Cell values, stored row-major as a (possibly ragged) list of
+            # rows, matching the nested lists that getValue/setValue
+            # exchange; getDataMatrix then only has to trim, not transpose.
+            # Cells hold arbitrary element-class values or None, which
+            # rules out packed primitive buffers (array.array and the
+            # like); the arrays edited here are hand-entered and small, so
+            # boxed storage is not a memory concern.
+            self.arraydata = self._convert(data)
             self.editorclass = editorclass
             self.node = node
-            
+
+            # The element class is fixed for the lifetime of the model;
+            # resolve it once here rather than via getValueType on every
+            # data() call. Rendered display strings and converted edit
+            # values are cached per (row,column,role) in _cellcache; setData
+            # drops the entries for an edited cell. Note that with sip API
+            # v2 returning None for empty cells and unsupported roles is
+            # free: it maps onto the invalid QVariant without allocation.
+            self.elementclass = node.getValueType(returnclass=True).elementclass
+            self._cellcache = {}
+
+            # Formatted strings shared between cells that hold the same
+            # primitive value, so zero- or constant-filled arrays format
+            # each distinct value only once.
+            self._pretty = {}
+
+            # When the row dimension is unbounded, rows are materialized
+            # lazily: the view starts out with a small window around the
+            # existing data and grows it through canFetchMore/fetchMore as
+            # the user scrolls, rather than announcing all 256*256 virtual
+            # rows up front (which makes the view lay out geometry and
+            # headers for the full virtual area).
+            self.fetchedrows = min(max(len(self.arraydata),64),256*256)
+
+            # Header strings, cached lazily: Qt re-requests header text on
+            # every repaint, and the Excel-style column names take a divmod
+            # loop to build each time.
+            self._hheaders = []
+            self._vheaders = []
+
+            # Memoized column count (excluding trailing missing values) for
+            # getDataMatrix; None when it must be recomputed by scanning.
+            # setData keeps it up to date incrementally.
+            self._ncol = None
+
+        @staticmethod
+        def _convert(arr):
+            # Iterative conversion: an explicit to-do stack of lists
+            # replaces the per-level Python calls of the former recursive
+            # version, and the sentinel and sequence types are hoisted into
+            # locals. Lists that need no per-element work (the common case
+            # for rows of plain scalars) are detected with one C-level
+            # any() scan and skipped wholesale.
+            empty = xmlstore.datatypes.DataTypeArray.empty
+            seqtypes = (list,tuple)
+            res = list(arr)
+            todo = [res]
+            while todo:
+                cur = todo.pop()
+                if not any(type(e) in seqtypes or e is empty for e in cur): continue
+                for i,e in enumerate(cur):
+                    if type(e) in seqtypes:
+                        e = list(e)
+                        cur[i] = e
+                        todo.append(e)
+                    elif e is empty:
+                        cur[i] = None
+            return res
+
+        def setArrayData(self,data):
+            """Replaces the complete array contents within a single model
+            reset, so attached views relayout once instead of per cell.
+            """
+            if data is None: data = []
+            self.beginResetModel()
+            self.arraydata = self._convert(data)
+            self._cellcache.clear()
+            self.fetchedrows = min(max(len(self.arraydata),64),256*256)
+            self._ncol = None
+            self.endResetModel()
+
         def getDataMatrix(self):
             nrow,ncol,hascolumns = None,None,False
             if self.shape is not None:
@@ -1002,6 +1556,13 @@ class ArrayEditor(AbstractPropertyEditor,QtWidgets.QTableView):
                 hascolumns = len(self.shape)>1
                 if hascolumns and self.shape[1] is not None: ncol = self.shape[1]
             
+            if nrow is not None and (not hascolumns or ncol is not None):
+                # Shape fully specified: no trailing-value scans are
+                # needed, and the padding reduces to one comprehension.
+                if not hascolumns: return self.arraydata[:nrow]
+                return [rowdata[:ncol] if len(rowdata)>=ncol else rowdata+[None]*(ncol-len(rowdata))
+                        for rowdata in self.arraydata[:nrow]]
+
             if nrow is None:
                 # Count the number of rows (ignore trailing missing values)
                 nrow = len(self.arraydata)
@@ -1010,15 +1571,18 @@ class ArrayEditor(AbstractPropertyEditor,QtWidgets.QTableView):
                     nrow -= 1
                     
             if hascolumns and ncol is None:
-                # Count the number of columns (ignore trailing missing values)
-                ncol = 0
-                for rowdata in self.arraydata[:nrow]:
-                    if rowdata is None or len(rowdata)<=ncol: continue
-                    curncol = len(rowdata)
-                    for coldata in reversed(rowdata):
-                        if coldata is not None: break
-                        curncol -= 1
-                    ncol = max(ncol,curncol)
+                ncol = self._ncol
+                if ncol is None:
+                    # Count the number of columns (ignore trailing missing values)
+                    ncol = 0
+                    for rowdata in self.arraydata[:nrow]:
+                        if rowdata is None or len(rowdata)<=ncol: continue
+                        curncol = len(rowdata)
+                        for coldata in reversed(rowdata):
+                            if coldata is not None: break
+                            curncol -= 1
+                        ncol = max(ncol,curncol)
+                    self._ncol = ncol
                 
             if not hascolumns:
                 # Take all rows except trailing missing values.
@@ -1050,9 +1614,22 @@ class ArrayEditor(AbstractPropertyEditor,QtWidgets.QTableView):
             if parent.isValid(): return 0
             
             l = self.shape[0]
-            if l is None: l = 256*256
+            if l is None: l = self.fetchedrows
             return l
 
+        def canFetchMore(self,parent=None):
+            if parent is not None and parent.isValid(): return False
+            return self.shape[0] is None and self.fetchedrows<256*256
+
+        def fetchMore(self,parent=None):
+            if parent is None: parent = QtCore.QModelIndex()
+            if parent.isValid(): return
+            newcount = min(self.fetchedrows+256,256*256)
+            if newcount<=self.fetchedrows: return
+            self.beginInsertRows(parent,self.fetchedrows,newcount-1)
+            self.fetchedrows = newcount
+            self.endInsertRows()
+
         def columnCount(self,parent=None):
             if parent is None: parent = QtCore.QModelIndex()
 
@@ -1070,44 +1647,63 @@ class ArrayEditor(AbstractPropertyEditor,QtWidgets.QTableView):
                 return QtCore.QAbstractItemModel.headerData(self,section,orientation,role)
                 
             if orientation==QtCore.Qt.Horizontal:
-                # Use Excel-style column names (A-Z, AA-ZZ, AAA-ZZZ, ...).
-                string = ''
-                quot = section
-                while True:
-                    quot,rem = divmod(quot,26)
-                    string = chr(ord('A')+rem)+string
-                    if quot==0: break
-                    quot -= 1
-                return string
+                # Use Excel-style column names (A-Z, AA-ZZ, AAA-ZZZ, ...),
+                # growing the cache up to the requested section.
+                headers = self._hheaders
+                for isection in range(len(headers),section+1):
+                    string = ''
+                    quot = isection
+                    while True:
+                        quot,rem = divmod(quot,26)
+                        string = chr(ord('A')+rem)+string
+                        if quot==0: break
+                        quot -= 1
+                    headers.append(string)
+                return headers[section]
             else:
                 # Use row number (1-based) as row name.
-                return str(section+1)
-
-        def data(self,index,role=QtCore.Qt.DisplayRole):
-            if role==QtCore.Qt.DisplayRole or role==QtCore.Qt.EditRole:
-                irow = index.row()
-                val = None
-                if irow<len(self.arraydata):
-                    val = self.arraydata[irow]
-                    if len(self.shape)>1:
-                        icol = index.column()
-                        if val is not None and icol<len(val):
-                            val = val[icol]
-                if val is None: return None
-                if role==QtCore.Qt.DisplayRole:
-                    cls = self.node.getValueType(returnclass=True).elementclass
-                    if not isinstance(val,cls): val = cls(val)
-                    return val.toPrettyString()
-                return self.editorclass.convertToQVariant(val)
-                
-            return None
+                headers = self._vheaders
+                for isection in range(len(headers),section+1):
+                    headers.append(str(isection+1))
+                return headers[section]
+
+        def data(self,index,role=_DISPLAYROLE):
+            # Reject unsupported roles before touching the data: the bulk
+            # of data() calls Qt makes while painting are for roles this
+            # model does not serve.
+            if role!=_DISPLAYROLE and role!=_EDITROLE: return None
+            irow,icol = index.row(),index.column()
+            val = None
+            if irow<len(self.arraydata):
+                val = self.arraydata[irow]
+                if len(self.shape)>1:
+                    if val is not None and icol<len(val):
+                        val = val[icol]
+            if val is None: return None
+            key = (irow,icol,role)
+            res = self._cellcache.get(key)
+            if res is None:
+                if role==_DISPLAYROLE:
+                    hashable = val.__class__ in (int,float,bool,str)
+                    if hashable: res = self._pretty.get(val)
+                    if res is None:
+                        cls = self.elementclass
+                        pretty = val if isinstance(val,cls) else cls(val)
+                        res = pretty.toPrettyString()
+                        if hashable:
+                            if len(self._pretty)>=4096: self._pretty.clear()
+                            self._pretty[val] = res
+                else:
+                    res = self.editorclass.convertToQVariant(val)
+                self._cellcache[key] = res
+            return res
             
         def clearData(self,index):
             self.setData(index,None)
             
-        def setData(self,index,value,role=QtCore.Qt.EditRole):
+        def setData(self,index,value,role=_EDITROLE):
             # Only process edit role
-            if role!=QtCore.Qt.EditRole: return False
+            if role!=_EDITROLE: return False
             
             # Get value in native data type (convert from QVariant)
             if not value.isValid():
@@ -1115,18 +1711,17 @@ class ArrayEditor(AbstractPropertyEditor,QtWidgets.QTableView):
             else:
                 value = self.editorclass.convertFromQVariant(value)
                 
-            # Get row index
-            irow = index.row()
-            
+            # Get cell position
+            irow,icol = index.row(),index.column()
+
             # Append additional rows if needed
             if irow>=len(self.arraydata):
                 if value is None: return True
                 self.arraydata += [None]*(irow-len(self.arraydata)+1)
-                
+
             if len(self.shape)>1:
                 # 2D array
-                icol = index.column()
-                
+
                 # Make sure the specified row exists and has the desired length.
                 if self.arraydata[irow] is None: self.arraydata[irow] = []
                 if icol>=len(self.arraydata[irow]):
@@ -1134,18 +1729,34 @@ class ArrayEditor(AbstractPropertyEditor,QtWidgets.QTableView):
                     self.arraydata[irow] += [None]*(icol-len(self.arraydata[irow])+1)
                     
                 self.arraydata[irow][icol] = value
+
+                # Maintain the memoized column count: a value at icol makes
+                # the count at least icol+1, while clearing the last column
+                # may shrink it and forces a rescan on next use.
+                if value is None:
+                    if self._ncol is not None and icol>=self._ncol-1: self._ncol = None
+                elif self._ncol is not None and icol>=self._ncol:
+                    self._ncol = icol+1
             else:
                 # 1D array
                 self.arraydata[irow] = value
-                
+
+            # Drop any cached display/edit data for the edited cell.
+            self._cellcache.pop((irow,icol,_DISPLAYROLE),None)
+            self._cellcache.pop((irow,icol,_EDITROLE),None)
+
             # Notify that data have changed.
             self.dataChanged.emit(index,index)
             
             # Return True (data successfully set)
             return True
 
+        # Every cell is enabled, selectable and editable; precompute the
+        # flag combination once instead of per flags() call.
+        _flags = QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEditable
+
         def flags(self,index):
-            return QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEditable
+            return self._flags
 
     def __init__(self,parent,node,**kwargs):
         QtWidgets.QTableView.__init__(self,parent)
@@ -1154,10 +1765,33 @@ class ArrayEditor(AbstractPropertyEditor,QtWidgets.QTableView):
         self.node = node
         self.datamodel = None
 
+        # Parse the template shape specification once; it cannot change
+        # during the lifetime of the editor.
+        strshape = node.templatenode.getAttribute('shape')
+        self.shape = None
+        if strshape!='':
+            self.shape = [None if l==':' else int(l) for l in strshape.split(',')]
+
     def keyPressEvent(self,event):
         if event.key()==QtCore.Qt.Key_Delete:
-            for ind in self.selectionModel().selectedIndexes():
-                self.datamodel.clearData(ind)
+            selected = self.selectionModel().selectedIndexes()
+            if not selected: return
+
+            # Clear all selected cells with model signals and repaints
+            # suppressed, then notify once for the enclosing rectangle of
+            # the selection instead of once per cell.
+            self.setUpdatesEnabled(False)
+            self.datamodel.blockSignals(True)
+            try:
+                for ind in selected:
+                    self.datamodel.clearData(ind)
+            finally:
+                self.datamodel.blockSignals(False)
+                self.setUpdatesEnabled(True)
+            rows = [ind.row() for ind in selected]
+            cols = [ind.column() for ind in selected]
+            self.datamodel.dataChanged.emit(self.datamodel.index(min(rows),min(cols)),
+                                            self.datamodel.index(max(rows),max(cols)))
         else:
             QtWidgets.QTableView.keyPressEvent(self,event)
 
@@ -1165,19 +1799,15 @@ class ArrayEditor(AbstractPropertyEditor,QtWidgets.QTableView):
         return self.datamodel.getDataMatrix()
 
     def setValue(self,value=None):
-        strshape = self.node.templatenode.getAttribute('shape')
-        shape = None
-        if strshape!='':
-            shape = []
-            for l in strshape.split(','):
-                if l==':':
-                    shape.append(None)
-                else:
-                    shape.append(int(l))
-
-        self.datamodel = self.Model(shape,value,self.node,self.elementeditorclass)
-        #self.horizontalHeader().setVisible(len(shape)>1)
-        self.setModel(self.datamodel)
+        shape = self.shape
+        if self.datamodel is not None and self.datamodel.shape==shape:
+            # Same shape: refill the existing model in one reset rather
+            # than constructing and attaching a brand-new model.
+            self.datamodel.setArrayData(value)
+        else:
+            self.datamodel = self.Model(shape,value,self.node,self.elementeditorclass)
+            #self.horizontalHeader().setVisible(len(shape)>1)
+            self.setModel(self.datamodel)
         
 # =======================================================================
 # TypedStoreModel: a Qt item model that encapsulates TypedStore
@@ -1187,7 +1817,13 @@ class TypedStoreModel(QtCore.QAbstractItemModel):
     """Qt item model that encapsulates TypedStore, used for hierarchical storage
     of typed properties.
     """
-    
+
+    # Fonts returned for FontRole, shared by all cells of all models; Qt
+    # queries the font per visible cell per repaint. Filled on first use.
+    _regularfont = None
+    _boldfont = None
+
+
     def __init__(self,typedstore,nohide = False, novalues = False, checkboxes = False):
         QtCore.QAbstractItemModel.__init__(self)
 
@@ -1196,17 +1832,66 @@ class TypedStoreModel(QtCore.QAbstractItemModel):
         self.novalues = novalues
         self.checkboxes = checkboxes
 
+        # Column count never changes after construction; precompute it so
+        # columnCount reduces to an attribute load.
+        self._columncount = 1 if novalues else 2
+
         self.storeinterface = self.typedstore.getInterface(showhidden=self.nohide,omitgroupers=True)
         self.storeinterface.processDefaultChange = 1    # Warn always if a default changes (even if it is not used)
 
         self.storeinterface.connect('beforeVisibilityChange',self.beforeNodeVisibilityChange)
         self.storeinterface.connect('afterVisibilityChange', self.afterNodeVisibilityChange)
         self.storeinterface.connect('afterChange',self.onNodeChanged)
-        self.storeinterface.connect('beforeStoreChange',self.beginResetModel)
-        self.storeinterface.connect('afterStoreChange',self.endResetModel)
+        self.storeinterface.connect('beforeStoreChange',self.beforeStoreChange)
+        self.storeinterface.connect('afterStoreChange',self.afterStoreChange)
 
         self.inheritingchecks = False
-        
+
+        # Cache of node row indices, keyed by id(node). getOwnIndex scans
+        # the node's sibling list (recursing through groupers) on every
+        # call, and Qt consults parent/dataChanged paths that need the row
+        # for every edit and repaint. Cleared whenever tree structure or
+        # visibility changes.
+        self._ownindexcache = {}
+
+        # Cache of visible-children lists, keyed by id(parent node). Qt
+        # calls rowCount and index for every visible row per repaint, and
+        # each interface call re-walks the child list with grouper
+        # recursion. Invalidated together with the row index cache.
+        self._childrencache = {}
+
+        # Cache of What's-this texts, keyed by id(node): the text is
+        # rebuilt from the template XML on every hover otherwise. It is
+        # per node rather than per template because getText can include
+        # the dynamic secondary id of clone nodes.
+        self._whatsthiscache = {}
+
+        # Cache of aggregate check states for parent nodes, keyed by
+        # id(node). Without it, a repaint of a checkable subtree recomputes
+        # every parent state from the full subtree below it. Entries are
+        # dropped up the ancestor chain when a node value changes, and the
+        # cache is cleared with the other tree caches.
+        self._checkstatecache = {}
+
+        # Cache of item flags, keyed by (id(node),column). Qt queries
+        # flags on focus, selection and paint; the flag bits only change
+        # when the tree structure does, so they are cleared with the other
+        # tree caches.
+        self._flagscache = {}
+
+        # Cache of hasDefaultValue results, keyed by id(node). The store
+        # query parses both the current and the default value per call,
+        # and it is made per node during the initial expansion and per
+        # paint for the bold-font highlight. Entries are dropped when the
+        # node (or its default) changes.
+        self._hasdefaultcache = {}
+
+        # Cache of per-subtree "contains a non-default value" flags, keyed
+        # by id(node). It lets the expansion walks skip entire branches
+        # that sit at their defaults - the common case. Entries are
+        # dropped up the ancestor chain when a node value changes.
+        self._nondefaultcache = {}
+
         # For debugging: model test functionality
         #import modeltest
         #self.mt = modeltest.ModelTest(self,self)
@@ -1214,7 +1899,55 @@ class TypedStoreModel(QtCore.QAbstractItemModel):
     def unlink(self):
         self.typedstore.disconnectInterface(self.storeinterface)
         self.storeinterface = None
-        
+
+    def _invalidateTreeCaches(self):
+        """Drops all cached results of tree-structure queries. Called
+        whenever nodes are shown, hidden, added or removed, and on store
+        replacement.
+        """
+        self._ownindexcache.clear()
+        self._childrencache.clear()
+        self._whatsthiscache.clear()
+        self._checkstatecache.clear()
+        self._flagscache.clear()
+        self._hasdefaultcache.clear()
+        self._nondefaultcache.clear()
+
+    def _getOwnIndex(self,node):
+        """Returns the row index of the given node, caching the result of
+        the sibling scan in the store interface.
+        """
+        irow = self._ownindexcache.get(id(node))
+        if irow is None:
+            irow = self.storeinterface.getOwnIndex(node)
+            self._ownindexcache[id(node)] = irow
+        return irow
+
+    def _getChildren(self,parentnode):
+        """Returns the list of visible children of the given parent node,
+        caching the result of the child walk in the store interface.
+        """
+        children = self._childrencache.get(id(parentnode))
+        if children is None:
+            children = self.storeinterface.getChildren(parentnode)
+            self._childrencache[id(parentnode)] = children
+        return children
+
+    def beforeStoreChange(self):
+        """Event handler. Called by the TypedStore just before the whole
+        store is replaced.
+        """
+        self._invalidateTreeCaches()
+        self.beginResetModel()
+
+    def afterStoreChange(self):
+        """Event handler. Called by the TypedStore just after the whole
+        store is replaced.
+        """
+        self._invalidateTreeCaches()
+        self.endResetModel()
+
+
     def index(self,irow,icolumn,parent):
         """Supplies unique index for the node at the given (row,column) position
         below the given parent (specified as index).
@@ -1230,11 +1963,13 @@ class TypedStoreModel(QtCore.QAbstractItemModel):
             parentnode = parent.internalPointer()
             
         # Get the child at the specified row index
-        child = self.storeinterface.getChildByIndex(parentnode,irow)
-        if child is None: return QtCore.QModelIndex()
-        assert isinstance(child,xmlstore.Node), 'Object returned by getChildByIndex is not of type "Node" (but "%s").' % child
+        children = self._getChildren(parentnode)
+        if irow>=len(children): return QtCore.QModelIndex()
+        child = children[irow]
 
-        # Return a newly created index for the child node.
+        # Return a newly created index for the child node. The child is an
+        # xmlstore.Node by contract of StoreInterface.getChildren - not
+        # asserted here, since Qt calls index() per visible cell per paint.
         return self.createIndex(irow,icolumn,child)
 
     def parent(self,index):
@@ -1244,19 +1979,19 @@ class TypedStoreModel(QtCore.QAbstractItemModel):
         # We must have a valid index.
         if not index.isValid(): return QtCore.QModelIndex()
 
-        # Get the node belonging to the provided index.
+        # Get the node belonging to the provided index. Both it and the
+        # result of getParent are xmlstore.Node objects by contract; as in
+        # index(), per-call isinstance checks are deliberately omitted here.
         current = index.internalPointer()
-        assert isinstance(current,xmlstore.Node), 'Node data is not a Node, but: %s.' % current
-        
+
         # Get the parent node.
         parent = self.storeinterface.getParent(current)
-        assert isinstance(parent,xmlstore.Node), 'Object returned by getParent is not of type "Node" (but "%s").' % (parent,)
 
         # If we reached the root, return an invalid index signifying the root.        
         if parent.parent is None: return QtCore.QModelIndex()
 
         # Get the row index of the parent.
-        iparentrow = self.storeinterface.getOwnIndex(parent)
+        iparentrow = self._getOwnIndex(parent)
         
         # Return a newly created index for the parent.
         return self.createIndex(iparentrow,0,parent)
@@ -1270,18 +2005,31 @@ class TypedStoreModel(QtCore.QAbstractItemModel):
         else:
             if parent.column()!=0: return 0
             parentnode = parent.internalPointer()
-        return self.storeinterface.getChildCount(parentnode)
+        return len(self._getChildren(parentnode))
+
+    def hasChildren(self,parent=QtCore.QModelIndex()):
+        """Returns whether the given parent (specified as index) has child rows.
+        inherited from QtCore.QAbstractItemModel
+
+        The default implementation answers this through virtual rowCount
+        and columnCount calls; answering from the children cache directly
+        saves those round-trips, as Qt asks this per row to decide whether
+        to draw an expansion handle.
+        """
+        if not parent.isValid():
+            parentnode = self.typedstore.root
+        else:
+            if parent.column()!=0: return False
+            parentnode = parent.internalPointer()
+        return len(self._getChildren(parentnode))>0
 
     def columnCount(self,parent):
         """Returns the number of child columns below the given parent (specified as index).
         inherited from QtCore.QAbstractItemModel
         """
-        if self.novalues:
-            return 1
-        else:
-            return 2
+        return self._columncount
 
-    def data(self,index,role=QtCore.Qt.DisplayRole):
+    def data(self,index,role=_DISPLAYROLE):
         """Returns data for the given node (specified as index), and the given role.
         inherited from QtCore.QAbstractItemModel
         """
@@ -1289,93 +2037,128 @@ class TypedStoreModel(QtCore.QAbstractItemModel):
         # In some cases (e.g. when using What's-this) this function is called for the root node
         # (i.e. with an invalid index). In that case we just return the default data value.
         if not index.isValid(): return None
-        
-        # Shortcut to the xmlstore.TypedStore node (used below in many places)
-        node = index.internalPointer()
-
-        # First handle roles that are shared over the whole row.
-        if role==QtCore.Qt.WhatsThisRole:
-            templatenode = node.templatenode
-            text = node.getText(detail=2)
-            nodetype = node.getValueType()
-            if templatenode.hasAttribute('hasoptions'):
-                optionsroot = util.findDescendantNode(templatenode,['options'])
-                assert optionsroot is not None, 'Variable with "select" type lacks "options" element below.'
-                optionnodes = util.findDescendantNodes(optionsroot,['option'])
-                assert len(optionnodes)>0, 'Variable with "select" type does not have any options assigned to it.'
-                text += '\n\nAvailable options:'
-                for optionnode in optionnodes:
-                    if optionnode.getAttribute('disabled')=='True': continue
-                    text += '\n- '
-                    if optionnode.hasAttribute('description'):
-                        text += optionnode.getAttribute('description')
-                    else:
-                        text += optionnode.getAttribute('label')
-            elif nodetype=='int' or nodetype=='float':
-                if templatenode.hasAttribute('minInclusive'): text += '\nminimum value: '+templatenode.getAttribute('minInclusive')
-                if templatenode.hasAttribute('maxInclusive'): text += '\nmaximum value: '+templatenode.getAttribute('maxInclusive')
-            return text
-        elif role==QtCore.Qt.TextColorRole:
-            if self.nohide and not node.visible:
-                # If we should show hidden nodes too, color them blue to differentiate.
-                return QtGui.QColor(0,0,255)
-            elif index.column()==1 and node.isReadOnly():
-                # Color read-only nodes grey to differentiate.
-                return QtGui.QColor(128,128,128)
-        elif self.checkboxes and role==QtCore.Qt.CheckStateRole:
-            if node.canHaveValue():
-                # Node has own checkbox.
-                if node.getValue():
-                    return QtCore.Qt.Checked
-                else:
-                    return QtCore.Qt.Unchecked
-            elif node.hasChildren():
-                # Node is parent of other nodes with their own checkbox; check value is derived from children.
-                state = None
-                for i in range(self.rowCount(index)):
-                    chstate = index.child(i,0).data(QtCore.Qt.CheckStateRole)
-                    if chstate==QtCore.Qt.PartiallyChecked:
-                        return QtCore.Qt.PartiallyChecked
-                    elif state is None:
-                        state = chstate
-                    elif chstate!=state:
-                        return QtCore.Qt.PartiallyChecked
-                return state
-
-        # Now handle column-specific roles.
-        if index.column()==0:
-            if role==QtCore.Qt.DisplayRole:
-                return node.getText(detail=1)
-            else:
-                return None
-        else:
-            # We only process the 'display', 'decoration', 'edit' and 'font' roles.
-            if role not in (QtCore.Qt.DisplayRole,QtCore.Qt.EditRole,QtCore.Qt.FontRole): return None
 
-            # Column 1 is only used for variables that can have a value.
-            if not node.canHaveValue(): return None
+        # Dispatch on role through the class-level handler table. The
+        # failed lookup doubles as the fast path for unhandled roles
+        # (size hint, tooltip, background, ...), which make up the bulk
+        # of Qt's queries: no separate membership test is needed.
+        handler = self._roledispatch.get(role)
+        if handler is None: return None
+        return handler(self,index,index.internalPointer(),role)
 
-            fieldtype = node.getValueType()
-            if role==QtCore.Qt.FontRole:
-                # Return bold font if the node value is set to something different than the default.
-                if self.typedstore.defaultstore is None: return None
-                font = QtGui.QFont()
-                font.setBold(not node.hasDefaultValue())
-                return font
-            elif role==QtCore.Qt.DisplayRole:
-                return node.getValueAsString(usedefault=True)
-            elif role==QtCore.Qt.EditRole:
-                value = node.getValue(usedefault=True)
-                if value is None: return None
-                editorclass = getEditor(fieldtype)
-                assert editorclass is not None, 'No editor class defined for data type "%s".' % fieldtype
-                result = editorclass.convertToQVariant(value)
-                #if isinstance(value,util.referencedobject): value.release()
-                return result
+    def _dataWhatsThis(self,index,node,role):
+        text = self._whatsthiscache.get(id(node))
+        if text is None:
+            text = self._buildWhatsThis(node)
+            self._whatsthiscache[id(node)] = text
+        return text
+
+    def _dataTextColor(self,index,node,role):
+        if self.nohide and not node.visible:
+            # If we should show hidden nodes too, color them blue to differentiate.
+            return _HIDDENCOLOR
+        elif index.column()==1 and _getNodeTraits(node.templatenode)[2]:
+            # Color read-only nodes grey to differentiate.
+            return _READONLYCOLOR
+
+    def _dataCheckState(self,index,node,role):
+        if not self.checkboxes: return None
+        return self._checkStateForNode(node)
+
+    def _checkStateForNode(self,node):
+        """Returns the check state for the given node, walking child nodes
+        directly: going through index.child(...).data(...) would construct
+        a QModelIndex and re-enter data() for every descendant.
+        """
+        if _getNodeTraits(node.templatenode)[0]:
+            # Node has own checkbox.
+            if node.getValue():
+                return _CHECKED
             else:
-                assert False, 'Don\'t know how to handle role %s.' % role
+                return _UNCHECKED
+        # Node is parent of other nodes with their own checkbox; check value is derived from children.
+        state = self._checkstatecache.get(id(node))
+        if state is None:
+            for child in self._getChildren(node):
+                chstate = self._checkStateForNode(child)
+                if chstate==_PARTIALLYCHECKED:
+                    state = _PARTIALLYCHECKED
+                    break
+                elif state is None:
+                    state = chstate
+                elif chstate!=state:
+                    state = _PARTIALLYCHECKED
+                    break
+            self._checkstatecache[id(node)] = state
+        return state
+
+    def _dataValue(self,index,node,role):
+        # Column 0 holds the node name; column 1 the value, for variables
+        # that can have one only.
+        if index.column()==0:
+            if role==_DISPLAYROLE: return node.getText(detail=1)
+            return None
+        canhavevalue,fieldtype,readonly = _getNodeTraits(node.templatenode)
+        if not canhavevalue: return None
+        if role==_DISPLAYROLE:
+            return node.getValueAsString(usedefault=True)
+        elif role==_EDITROLE:
+            value = node.getValue(usedefault=True)
+            if value is None: return None
+            editorclass = getEditor(fieldtype)
+            assert editorclass is not None, 'No editor class defined for data type "%s".' % fieldtype
+            result = editorclass.convertToQVariant(value)
+            #if isinstance(value,util.referencedobject): value.release()
+            return result
+        else:
+            # Return bold font if the node value is set to something different than the default.
+            if self.typedstore.defaultstore is None: return None
+            if TypedStoreModel._boldfont is None:
+                # Built on first use rather than at import, because fonts
+                # should not be created before the QApplication exists.
+                TypedStoreModel._regularfont = QtGui.QFont()
+                boldfont = QtGui.QFont()
+                boldfont.setBold(True)
+                TypedStoreModel._boldfont = boldfont
+            return self._regularfont if self._hasDefaultValue(node) else self._boldfont
+
+    # Role dispatch table for data(). Class-level, so the values are plain
+    # functions receiving self explicitly.
+    _roledispatch = {_WHATSTHISROLE: _dataWhatsThis,
+                     _TEXTCOLORROLE: _dataTextColor,
+                     _CHECKSTATEROLE: _dataCheckState,
+                     _DISPLAYROLE: _dataValue,
+                     _EDITROLE: _dataValue,
+                     _FONTROLE: _dataValue}
+
+    def _buildWhatsThis(self,node):
+        """Builds the What's-this text for the given node from its template.
+        """
+        templatenode = node.templatenode
+        # Accumulate fragments and join once at the end, rather than
+        # growing a string with += per option.
+        parts = [node.getText(detail=2)]
+        nodetype = _getNodeTraits(templatenode)[1]
+        if templatenode.hasAttribute('hasoptions'):
+            optionnodes = _getOptionNodes(templatenode)
+            parts.append('\n\nAvailable options:')
+            for optionnode in optionnodes:
+                if optionnode.getAttribute('disabled')=='True': continue
+                parts.append('\n- ')
+                if optionnode.hasAttribute('description'):
+                    parts.append(optionnode.getAttribute('description'))
+                else:
+                    parts.append(optionnode.getAttribute('label'))
+        elif nodetype=='int' or nodetype=='float':
+            if templatenode.hasAttribute('minInclusive'):
+                parts.append('\nminimum value: ')
+                parts.append(templatenode.getAttribute('minInclusive'))
+            if templatenode.hasAttribute('maxInclusive'):
+                parts.append('\nmaximum value: ')
+                parts.append(templatenode.getAttribute('maxInclusive'))
+        return ''.join(parts)
 
-    def setData(self,index,value,role=QtCore.Qt.EditRole):
+    def setData(self,index,value,role=_EDITROLE):
         """Set data for the given node (specified as index), and the given role.
         inherited from QtCore.QAbstractItemModel
         """
@@ -1383,26 +2166,47 @@ class TypedStoreModel(QtCore.QAbstractItemModel):
         node = index.internalPointer()
 
         # Handle the case where nodes have checkboxes, and the check state changed.
-        if self.checkboxes and role==QtCore.Qt.CheckStateRole:
-            if node.canHaveValue():
+        if self.checkboxes and role==_CHECKSTATEROLE:
+            if _getNodeTraits(node.templatenode)[0]:
                 node.setValue(value)
                 self.dataChanged.emit(index,index)
             elif node.hasChildren():
                 checkroot = (not self.inheritingchecks)
                 self.inheritingchecks = True
-                for i in range(self.rowCount(index)):
-                    self.setData(index.child(i,0),value,role=QtCore.Qt.CheckStateRole)
-                self.dataChanged.emit(index,index)
+                # Propagate the check state over the subtree iteratively,
+                # setting node values directly instead of re-entering
+                # setData per descendant. Children sharing a parent are
+                # covered by one ranged dataChanged emission; ranges cannot
+                # span tree levels, so one emission per visited parent is
+                # the minimum.
+                emit = self.dataChanged.emit
+                queue = collections.deque([node])
+                while queue:
+                    parnode = queue.popleft()
+                    children = self._getChildren(parnode)
+                    for child in children:
+                        if _getNodeTraits(child.templatenode)[0]:
+                            child.setValue(value)
+                        elif child.hasChildren():
+                            queue.append(child)
+                    if children:
+                        emit(self.createIndex(0,0,children[0]),
+                             self.createIndex(len(children)-1,0,children[-1]))
+                emit(index,index)
                 if checkroot: self.inheritingchecks = False
             if not self.inheritingchecks:
+                # One emission per ancestor is unavoidable here: a ranged
+                # dataChanged requires both corners to share a parent, and
+                # each ancestor lives at a different tree level.
+                emit = self.dataChanged.emit
                 par = index.parent()
                 while par.isValid():
-                    self.dataChanged.emit(par,par)
+                    emit(par,par)
                     par = par.parent()
             return True
 
         # From this point on, we only process the EditRole for column 1.
-        if role!=QtCore.Qt.EditRole or index.column()!=1: return False
+        if role!=_EDITROLE or index.column()!=1: return False
 
         if not value.isValid():
             # An invalid QVariant was passed: clear the node value.
@@ -1410,7 +2214,7 @@ class TypedStoreModel(QtCore.QAbstractItemModel):
         else:
             # Convert the supplied QVariant to the node data type,
             # set the node value, and release the value object if applicable.
-            fieldtype = node.getValueType()
+            fieldtype = _getNodeTraits(node.templatenode)[1]
             editorclass = getEditor(fieldtype)
             assert editorclass is not None, 'No editor class defined for data type "%s".' % fieldtype
             value = editorclass.convertFromQVariant(value)
@@ -1430,26 +2234,32 @@ class TypedStoreModel(QtCore.QAbstractItemModel):
         # If we do not have a valid index, return the default.
         if not index.isValid(): return QtCore.QAbstractItemModel.flags(self,index)
 
-        # Default flags: selectable and enabled
-        f = QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEnabled
-
         node = index.internalPointer()
+        key = (id(node),index.column())
+        f = self._flagscache.get(key)
+        if f is None:
+            # Default flags: selectable and enabled
+            f = QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEnabled
 
-        # Add checkbox if needed
-        if self.checkboxes:
-            f |= QtCore.Qt.ItemIsUserCheckable
-            if node.hasChildren(): f |= QtCore.Qt.ItemIsTristate
+            # Add checkbox if needed
+            if self.checkboxes:
+                f |= QtCore.Qt.ItemIsUserCheckable
+                if node.hasChildren(): f |= QtCore.Qt.ItemIsTristate
+
+            # Make editable if it's the 1st column and the node is editable.
+            if key[1]==1:
+                traits = _getNodeTraits(node.templatenode)
+                if traits[0] and not traits[2]: f |= QtCore.Qt.ItemIsEditable
+
+            self._flagscache[key] = f
 
-        # Make editable if it's the 1st column and the node is editable.
-        if index.column()==1 and node.canHaveValue() and (not node.isReadOnly()): f |= QtCore.Qt.ItemIsEditable
-            
         return f
 
     def headerData(self,section,orientation,role):
         """Returns the header for the given row or column (in our case columns only).
         inherited from QtCore.QAbstractItemModel
         """
-        if role==QtCore.Qt.DisplayRole:
+        if role==_DISPLAYROLE:
             if section==0:
                 return 'variable'
             elif section==1:
@@ -1457,8 +2267,9 @@ class TypedStoreModel(QtCore.QAbstractItemModel):
         return None
         
     def indexFromNode(self,node,column=0):
-        assert isinstance(node,xmlstore.Node), 'indexFromNode: supplied object is not of type "Node" (but "%s").' % (node,)
-        irow = self.storeinterface.getOwnIndex(node)
+        if __debug__:
+            assert isinstance(node,xmlstore.Node), 'indexFromNode: supplied object is not of type "Node" (but "%s").' % (node,)
+        irow = self._getOwnIndex(node)
         return self.createIndex(irow,column,node)
 
     def beforeNodeVisibilityChange(self,nodes,newvisibility,showhide):
@@ -1468,22 +2279,36 @@ class TypedStoreModel(QtCore.QAbstractItemModel):
         added showhide will be False. If the node is shown or added, newvisibility will
         be True; if the node is hidden or deleted, newvisibility will be False.
         """
-        # Debug check of function arguments (must be a list of nodes)
-        for node in nodes:
-            assert isinstance(node,xmlstore.Node), 'Supplied object is not of type "Node" (but "%s").' % node
+        # Debug check of function arguments (must be a list of nodes). The
+        # __debug__ guard lets python -O skip the loop itself, not just the
+        # asserts inside it.
+        if __debug__:
+            for node in nodes:
+                assert isinstance(node,xmlstore.Node), 'Supplied object is not of type "Node" (but "%s").' % node
 
         # If we will show hidden nodes and the change refers to visibility, do nothing.
         if self.nohide and showhide: return
-        
-        # Get row number and parent index of the first node.
+
+        # The tree structure is about to change: cached query results go stale.
+        self._invalidateTreeCaches()
+
+        # Get row number and parent index of the first node. The parent
+        # index is built directly from the parent node, rather than through
+        # parent(createIndex(...)), which would construct a throwaway
+        # QModelIndex just to take it apart again.
         ifirstrow = self.storeinterface.getOwnIndex(nodes[0])
-        par = self.parent(self.createIndex(ifirstrow,1,nodes[0]))
-        
+        parentnode = self.storeinterface.getParent(nodes[0])
+        if parentnode.parent is None:
+            par = QtCore.QModelIndex()
+        else:
+            par = self.createIndex(self.storeinterface.getOwnIndex(parentnode),0,parentnode)
+
         # Get row number of last node, and make sure the nodes are contiguous.
         if len(nodes)>1:
             ilastrow = self.storeinterface.getOwnIndex(nodes[-1])
-            assert par==self.parent(self.createIndex(ilastrow,1,nodes[-1])), 'Nodes supplied to beforeNodeVisibilityChange do not share the same parent.'
-            assert ilastrow-ifirstrow+1==len(nodes), 'Node block supplied to beforeNodeVisibilityChange is not contiguous.'
+            if __debug__:
+                assert self.storeinterface.getParent(nodes[-1]) is parentnode, 'Nodes supplied to beforeNodeVisibilityChange do not share the same parent.'
+                assert ilastrow-ifirstrow+1==len(nodes), 'Node block supplied to beforeNodeVisibilityChange is not contiguous.'
         else:
             ilastrow = ifirstrow
 
@@ -1501,15 +2326,20 @@ class TypedStoreModel(QtCore.QAbstractItemModel):
         be True; if the node is hidden or deleted, newvisibility will be False.
         """
         # Debug check of function arguments (must be a list of nodes)
-        for node in nodes:
-            assert isinstance(node,xmlstore.Node), 'Supplied object is not of type "Node" (but "%s").' % node
-        
+        if __debug__:
+            for node in nodes:
+                assert isinstance(node,xmlstore.Node), 'Supplied object is not of type "Node" (but "%s").' % node
+
         # If we show hidden nodes and the change refers to visibility,
         # only the color of the node will change: make Qt4 update the node display.
         if self.nohide and showhide:
             for node in nodes: self.onNodeChanged(node,'visibility',headertoo=True)
             return
-        
+
+        # The tree structure has changed: row indices cached before (or
+        # while) handling the change are stale.
+        self._invalidateTreeCaches()
+
         # Notify Qt4 about visibility change.
         if newvisibility:
             self.endInsertRows()
@@ -1523,13 +2353,30 @@ class TypedStoreModel(QtCore.QAbstractItemModel):
         used only internally, and specified that the header (i.e., descriptive name)
         has also changed and must be redrawn.
         """
-        assert isinstance(node,xmlstore.Node), 'Supplied object is not of type "Node" (but "%s").' % node
-        irow = self.storeinterface.getOwnIndex(node)
-        index = self.createIndex(irow,1,node)
-        self.dataChanged.emit(index,index)
-
+        if __debug__:
+            assert isinstance(node,xmlstore.Node), 'Supplied object is not of type "Node" (but "%s").' % node
+        # The node's value (or its default - this handler also fires for
+        # default changes) is no longer what was cached, and neither are
+        # the subtree aggregates (non-default flags, and check states when
+        # checkboxes are shown) up the ancestor chain. (This handler fires
+        # for programmatic value changes as well as edits through the
+        # model.)
+        self._hasdefaultcache.pop(id(node),None)
+        self._nondefaultcache.pop(id(node),None)
+        if self.checkboxes: self._checkstatecache.pop(id(node),None)
+        par = node.parent
+        while par is not None:
+            self._nondefaultcache.pop(id(par),None)
+            if self.checkboxes: self._checkstatecache.pop(id(par),None)
+            par = par.parent
+        irow = self._getOwnIndex(node)
         if headertoo:
-            index = self.createIndex(irow,0,node)
+            # Both columns changed: emit a single ranged signal over the
+            # row (both corners share the same parent) rather than one
+            # signal per column.
+            self.dataChanged.emit(self.createIndex(irow,0,node),self.createIndex(irow,1,node))
+        else:
+            index = self.createIndex(irow,1,node)
             self.dataChanged.emit(index,index)
 
     def resetData(self,index,recursive=False):
@@ -1545,21 +2392,68 @@ class TypedStoreModel(QtCore.QAbstractItemModel):
         set to its default value.
         """
         node = index.internalPointer()
-        if node is None or not node.canHaveValue(): return True
-        return node.hasDefaultValue()
+        if node is None or not _getNodeTraits(node.templatenode)[0]: return True
+        return self._hasDefaultValue(node)
+
+    def _hasDefaultValue(self,node):
+        """Returns whether the given node holds its default value, caching
+        the answer: the store-level query parses both the current and the
+        default value on every call.
+        """
+        hasdef = self._hasdefaultcache.get(id(node))
+        if hasdef is None:
+            hasdef = node.hasDefaultValue()
+            self._hasdefaultcache[id(node)] = hasdef
+        return hasdef
+
+    def hasNonDefaultDescendant(self,index=QtCore.QModelIndex()):
+        """Returns whether the subtree headed by the given index - the
+        indexed node itself included - contains any node with a value that
+        differs from its default.
+        """
+        node = index.internalPointer() if index.isValid() else self.typedstore.root
+        return self._subtreeHasNonDefault(node)
+
+    def _subtreeHasNonDefault(self,node):
+        """Node-level worker for hasNonDefaultDescendant, caching the
+        per-subtree flag so that branches sitting at their defaults are
+        evaluated once rather than re-walked by every expansion pass.
+        """
+        res = self._nondefaultcache.get(id(node))
+        if res is None:
+            res = _getNodeTraits(node.templatenode)[0] and not self._hasDefaultValue(node)
+            if not res:
+                for child in self._getChildren(node):
+                    if self._subtreeHasNonDefault(child):
+                        res = True
+                        break
+            self._nondefaultcache[id(node)] = res
+        return res
 
     def getCheckedNodes(self,index=None):
         """Returns a list of all nodes that have been checked. Applies only if the
         model has checkboxes in from of each node.
         """
-        if index is None: index = QtCore.QModelIndex()
+        if not self.checkboxes: return []
+        if index is None or not index.isValid():
+            root = self.typedstore.root
+        else:
+            root = index.internalPointer()
+
+        # Walk the tree with an explicit stack rather than recursively:
+        # this visits the nodes in the same pre-order, but without a
+        # Python call frame (and list concatenation) per node. The walk
+        # operates on nodes directly - the check state and children come
+        # from the model caches, without a QModelIndex plus data() call
+        # per visited node.
+        checkstate,children,checked = self._checkStateForNode,self._getChildren,_CHECKED
         res = []
-        for irow in range(self.rowCount(index)):
-            child = self.index(irow,0,index)
-            state = child.data(QtCore.Qt.CheckStateRole)
-            if state==QtCore.Qt.Checked:
-                res.append(child.internalPointer())
-            res += self.getCheckedNodes(child)
+        stack = list(reversed(children(root)))
+        while stack:
+            child = stack.pop()
+            if checkstate(child)==checked:
+                res.append(child)
+            stack.extend(reversed(children(child)))
         return res
 
 # =======================================================================
@@ -1577,6 +2471,17 @@ class ExtendedTreeView(QtWidgets.QTreeView):
         super(ExtendedTreeView,self).__init__(parent)
         self.autoexpandnondefaults = autoexpandnondefaults
 
+        # Insertions from rowsInserted waiting to be processed in batch, as
+        # (isroot,persistent parent index,persistent child indices,count)
+        # tuples. The zero-interval timer is parented to the view so a
+        # pending callback dies with it, rather than firing on a deleted
+        # widget.
+        self._pendinginserts = []
+        self._inserttimer = QtCore.QTimer(self)
+        self._inserttimer.setSingleShot(True)
+        self._inserttimer.setInterval(0)
+        self._inserttimer.timeout.connect(self._processPendingInserts)
+
     def setExpandedAll(self,value=True,maxdepth=1000,root=None,depth=0):
         """Expands/collapses all branches in the tree below the given root node
         (if not specified the actual model root is used), upto the specified depth.
@@ -1587,28 +2492,97 @@ class ExtendedTreeView(QtWidgets.QTreeView):
         """
         model = self.model()
         if root is None: root=QtCore.QModelIndex()
-        rc = model.rowCount(root)
-        if rc>0:
-            self.setExpanded(root,value)
-            if depth<maxdepth:
-                for ich in range(rc):
-                    ch = model.index(ich,0,root)
-                    self.setExpandedAll(value=value,root=ch,depth=depth+1,maxdepth=maxdepth)
+
+        # Walk the subtree with an explicit stack rather than recursively:
+        # one Python call frame per node adds up on deep trees, and the
+        # model callables are bound to locals outside the loop.
+        getindex,rowcount,setexpanded = model.index,model.rowCount,self.setExpanded
+
+        # Suppress repaints while toggling many branches: each setExpanded
+        # call otherwise invalidates the viewport layout separately.
+        enabled = self.updatesEnabled()
+        if enabled: self.setUpdatesEnabled(False)
+        try:
+            stack = [(root,depth)]
+            while stack:
+                index,depth = stack.pop()
+                rc = rowcount(index)
+                if rc>0:
+                    setexpanded(index,value)
+                    if depth<maxdepth:
+                        depth += 1
+                        stack.extend((getindex(ich,0,index),depth) for ich in range(rc))
+        finally:
+            if enabled: self.setUpdatesEnabled(True)
 
     def expandNonDefaults(self,root=None):
         """Selectively expands branches of the tree to ensure that all nodes that are
-        set to a value other than the default are visible.
+        set to a value other than the default are visible. Returns whether the subtree
+        below (and including) the given root contains any non-default node.
         """
         model = self.model()
         if root is None: root=QtCore.QModelIndex()
-        exp = False
-        for ich in range(model.rowCount(root)):
-            ch = model.index(ich,0,root)
-            if self.expandNonDefaults(root=ch):
-                exp = True
-        if exp: self.expand(root)
-        if not model.hasDefaultValue(root): exp = True
-        return exp
+
+        # Pre-order walk that only descends into branches the model
+        # reports as containing a non-default value: branches sitting
+        # entirely at their defaults - the common case - are skipped
+        # wholesale.
+        getindex,rowcount,hasnondef,expand = model.index,model.rowCount,model.hasNonDefaultDescendant,self.expand
+
+        # Suppress repaints while expanding, as in setExpandedAll.
+        enabled = self.updatesEnabled()
+        if enabled: self.setUpdatesEnabled(False)
+        try:
+            stack = [root]
+            while stack:
+                index = stack.pop()
+                exp = False
+                for ich in range(rowcount(index)):
+                    child = getindex(ich,0,index)
+                    if hasnondef(child):
+                        exp = True
+                        stack.append(child)
+                if exp: expand(index)
+        finally:
+            if enabled: self.setUpdatesEnabled(True)
+        return hasnondef(root)
+
+    def _initialExpand(self,maxdepth,root=None):
+        """Performs the initial expansion of the tree in a single walk:
+        branches up to the given depth are expanded unconditionally, and
+        deeper branches whenever they contain a non-default node. This
+        matches setExpandedAll(maxdepth=...) followed by
+        expandNonDefaults(), but traverses the model once instead of
+        twice.
+        """
+        model = self.model()
+        if root is None: root=QtCore.QModelIndex()
+        getindex,rowcount,hasnondef,setexpanded = model.index,model.rowCount,model.hasNonDefaultDescendant,self.setExpanded
+
+        # Suppress repaints while expanding, as in setExpandedAll. The
+        # walk is pre-order: within the depth limit every branch is
+        # visited, beyond it only branches containing a non-default value.
+        enabled = self.updatesEnabled()
+        if enabled: self.setUpdatesEnabled(False)
+        try:
+            stack = [(root,0)]
+            while stack:
+                index,depth = stack.pop()
+                rc = rowcount(index)
+                if rc==0: continue
+                exp = depth<=maxdepth
+                withindepth = depth<maxdepth
+                depth += 1
+                for ich in range(rc):
+                    child = getindex(ich,0,index)
+                    if hasnondef(child):
+                        exp = True
+                        stack.append((child,depth))
+                    elif withindepth:
+                        stack.append((child,depth))
+                if exp: setexpanded(index,True)
+        finally:
+            if enabled: self.setUpdatesEnabled(True)
 
     def contextMenuEvent(self,e):
         """Called internally when the user wants to display a context menu.
@@ -1630,9 +2604,12 @@ class ExtendedTreeView(QtWidgets.QTreeView):
             valueindex = index
 
         # Check whether we can reset the current value and/or its decendants. Stop if not.
+        # The cheapest test (a cached child-list length check) comes first;
+        # the editability bit then guards the hasDefaultValue query, so the
+        # store is never consulted for read-only or valueless rows.
         model = self.model()
-        resetself = (model.flags(valueindex) & QtCore.Qt.ItemIsEditable) and not model.hasDefaultValue(valueindex)
         resetchildren = model.hasChildren(nameindex)
+        resetself = bool(model.flags(valueindex) & QtCore.Qt.ItemIsEditable) and not model.hasDefaultValue(valueindex)
         if not (resetself or resetchildren): return
         
         # Build context menu
@@ -1651,17 +2628,59 @@ class ExtendedTreeView(QtWidgets.QTreeView):
         parent node is automatically expanded.
         """
         QtWidgets.QTreeView.rowsInserted(self,parent,start,end)
-                
-        # If needed, expand all child rows that were set to a non-default value.
+
+        # Bulk insertions arrive as a burst of these calls; expanding each
+        # new subtree immediately would walk them one call at a time.
+        # Queue the insertion and handle the whole burst in one batch when
+        # control returns to the event loop. Persistent indices keep the
+        # parent and the inserted children valid across insertions that
+        # are still to come (a later insertion above a queued range would
+        # shift plain row numbers); the model root needs a separate flag,
+        # since an invalid persistent index is indistinguishable from one
+        # whose row has disappeared.
+        model = self.model()
         if self.autoexpandnondefaults:
-            for i in range(start,end+1):
-                self.expandNonDefaults(parent.child(i,0))
-                
-        # Auto-expand if the newly inserted rows were the very first children of the parent.
-        # This will make sure that insertion of rows will not go unnoticed.
+            children = [QtCore.QPersistentModelIndex(model.index(i,0,parent)) for i in range(start,end+1)]
+        else:
+            children = ()
+        self._pendinginserts.append((not parent.isValid(),QtCore.QPersistentModelIndex(parent),children,end-start+1))
+        self._inserttimer.start()
+
+    def _processPendingInserts(self):
+        """Processes all queued row insertions in one batch: expands inserted
+        subtrees holding non-default values, and auto-expands parents that
+        received their very first children. This will make sure that insertion
+        of rows will not go unnoticed.
+        """
+        pending,self._pendinginserts = self._pendinginserts,[]
         model = self.model()
-        if model.rowCount(parent)==end-start+1:
-            self.expand(parent)
+        if model is None: return
+
+        # Total number of rows inserted per parent, to recognize parents
+        # whose children all stem from this batch.
+        counts = {}
+        for isroot,pparent,children,count in pending:
+            key = (isroot,pparent)
+            counts[key] = counts.get(key,0)+count
+
+        expanded = set()
+        for isroot,pparent,children,count in pending:
+            if isroot:
+                parent = QtCore.QModelIndex()
+            else:
+                if not pparent.isValid(): continue
+                parent = model.index(pparent.row(),pparent.column(),pparent.parent())
+
+            # If needed, expand all child rows that were set to a non-default value.
+            for pchild in children:
+                if pchild.isValid():
+                    self.expandNonDefaults(model.index(pchild.row(),0,parent))
+
+            # Auto-expand if the newly inserted rows are the very first children of the parent.
+            key = (isroot,pparent)
+            if key not in expanded and model.rowCount(parent)==counts[key]:
+                expanded.add(key)
+                self.expand(parent)
 
 class TypedStoreTreeView(ExtendedTreeView):
     
@@ -1697,8 +2716,7 @@ class TypedStoreTreeView(ExtendedTreeView):
         if self.rootnode is None or not self.rootnode.isHidden():
             self.setModel(self.storemodel)
             if self.rootnode is not None: self.setRootIndex(self.storemodel.indexFromNode(self.rootnode))
-            self.setExpandedAll(maxdepth=self.expanddepth)
-            self.expandNonDefaults()
+            self._initialExpand(self.expanddepth)
             if resizeheader: self.header().resizeSection(0,.65*self.width())
         else:
             self.setModel(None)
@@ -1810,13 +2828,32 @@ class PropertyEditorFactory(object):
         self.editors = []
         self.externaleditors = []
 
+        # Editors additionally indexed by id(node): store change events
+        # arrive per node, and the index lets them dispatch straight to
+        # the affected editors instead of scanning the full editor list
+        # on every event.
+        self._editorsbynode = {}
+        self._externalbynode = {}
+
         if self.live:
             self.storeinterface = self.store.getInterface()
             self.storeinterface.connect('afterChange',self.onStoreNodeChanged)
             self.storeinterface.connect('afterVisibilityChange',self.onStoreVisibilityChanged)
-            
+
+            # Single-shot timer that coalesces rapid edit notifications
+            # (e.g. spinbox auto-repeat) into one store write, rather than
+            # writing to the store - and broadcasting the resulting change
+            # to all connected interfaces - per notification.
+            self._pendingeditors = []
+            self._edittimer = QtCore.QTimer()
+            self._edittimer.setSingleShot(True)
+            self._edittimer.setInterval(50)
+            self._edittimer.timeout.connect(self._commitPendingEdits)
+
     def unlink(self):
         if self.live:
+            self._edittimer.stop()
+            self._commitPendingEdits()
             self.store.disconnectInterface(self.storeinterface)
             self.storeinterface = None
         for editor in self.editors:
@@ -1852,7 +2889,8 @@ class PropertyEditorFactory(object):
         
         # Add the editor to our list of editors.
         self.editors.append(editor)
-        
+        self._editorsbynode.setdefault(id(node),[]).append(editor)
+
         return editor
         
     def destroyEditor(self,editor,layout=None):
@@ -1863,12 +2901,27 @@ class PropertyEditorFactory(object):
         for i in range(len(self.editors)-1,-1,-1):
             if self.editors[i] is editor:
                 del self.editors[i]
+                editors = self._editorsbynode.get(id(editor.node))
+                if editors is not None:
+                    editors.remove(editor)
+                    if not editors: del self._editorsbynode[id(editor.node)]
+                if self.live and editor in self._pendingeditors:
+                    # Commit the edit still waiting on the debounce timer
+                    # before the widgets go away: the timer must not fire
+                    # for a destroyed editor.
+                    self._pendingeditors.remove(editor)
+                    if not editor.updateStore(): editor.updateEditorValue()
                 editor.destroy(layout)
                 break
 
     def updateStore(self):
         """Updates the TypedStore with the values currently set in all attached editors.
         """
+        if self.live:
+            # All editors are about to be committed below; drop any edit
+            # still waiting on the debounce timer.
+            self._edittimer.stop()
+            del self._pendingeditors[:]
         for editor in self.editors:
             editor.updateStore()
 
@@ -1883,12 +2936,13 @@ class PropertyEditorFactory(object):
         changed. Here we make sure that any editors associated with the changed node show
         the new value.
         """
-        for editor in self.editors:
-            if editor.node is node:
-                editor.updateEditorValue()
-                break
-        for (editor,conditionnode,conditiontype,conditionvalue) in self.externaleditors:
-            if conditionnode==node and conditiontype!='visibility':
+        editors = self._editorsbynode.get(id(node))
+        if editors:
+            # As before the node index was introduced: only the first
+            # editor attached to the node is refreshed.
+            editors[0].updateEditorValue()
+        for (editor,conditionnode,conditiontype,conditionvalue) in self._externalbynode.get(id(node),()):
+            if conditiontype!='visibility':
                 valuematch = node.getValue(usedefault=True)==conditionvalue
                 newviz = (conditiontype=='eq' and valuematch) or (conditiontype=='ne' and not valuematch)
                 editor.setVisible(newviz)
@@ -1905,10 +2959,10 @@ class PropertyEditorFactory(object):
             nodeloc = '/'.join(node.location)
             for editor in self.editors:
                 #if node is editor.node:
-                if ('/'.join(editor.node.location)).startswith(nodeloc):
+                if editor.locationstr.startswith(nodeloc):
                     editor.updateEditorEnabled()
-            for (editor,conditionnode,conditiontype,conditionvalue) in self.externaleditors:
-                if conditionnode==node and conditiontype=='visibility':
+            for (editor,conditionnode,conditiontype,conditionvalue) in self._externalbynode.get(id(node),()):
+                if conditiontype=='visibility':
                     editor.setVisible(visible)
 
     def onNodeEdited(self,editor):
@@ -1916,8 +2970,17 @@ class PropertyEditorFactory(object):
         """
         self.changed = True
         if self.live:
+            if editor not in self._pendingeditors:
+                self._pendingeditors.append(editor)
+            self._edittimer.start()
+
+    def _commitPendingEdits(self):
+        """Writes the values of editors with pending (debounced) edits to the store.
+        """
+        pending,self._pendingeditors = self._pendingeditors,[]
+        for editor in pending:
             if not editor.updateStore(): editor.updateEditorValue()
-            
+
     def getEditedNodes(self):
         """Returns a list of all nodes associated with this PropertyEditorFactory.
         """
@@ -1927,6 +2990,7 @@ class PropertyEditorFactory(object):
         if isinstance(node, (str, u''.__class__)):
             node = self.store[node]
         self.externaleditors.append((editor,node,conditiontype,conditionvalue))
+        self._externalbynode.setdefault(id(node),[]).append(self.externaleditors[-1])
         if conditiontype=='visibility':
             newviz = not node.isHidden()
         else:
@@ -1962,6 +3026,11 @@ class PropertyEditor(object):
         self.changehandlers = []
         self.suppresschangeevent = False
         self.location = node.location[:]
+
+        # Joined once here: visibility events compare editor locations by
+        # path prefix, and rebuilding the string per editor per event is
+        # pure allocation work.
+        self.locationstr = '/'.join(self.location)
         
     def addToGridLayout(self,gridlayout,irow=None,icolumn=0,rowspan=1,colspan=1,label=True,unit=True,icon=None):
         """Adds the editor plus label to an existing QGridLayout, in the specified row, starting at the specified column.
@@ -2125,7 +3194,7 @@ class PropertyEditor(object):
         else:
             # Create a normal editor that derives from AbstractPropertyEditor
             editor = createEditor(node,parent,**kwargs)
-            editor.propertyEditingFinished_callbacks.append(self.onChange)
+            editor.addPropertyEditingFinishedCallback(self.onChange)
             
         # Add what's-this information.
         if whatsthis and isinstance(editor,QtWidgets.QWidget):
@@ -2162,4 +3231,14 @@ class PropertyEditor(object):
         elif nodetype=='bool':
             # Checkbox for boolean
             return node.setValue(editor.checkState()==QtCore.Qt.Checked)
-            
+
+# Link the built-in data type names to their editor classes. This must come
+# at the bottom of the module, because the editor classes have to exist.
+editors.update({'string'  :StringEditor,
+                'int'     :IntEditor,
+                'float'   :ScientificDoubleEditor,
+                'bool'    :BoolEditor,
+                'datetime':DateTimeEditor,
+                'duration':DurationEditor,
+                'color'   :ColorEditor})
+
@@ -28,46 +28,67 @@ if 'QT_API' in os.environ:
     else:
         print('Qt backend "%s" set in environment variable "QT_API" not found. Auto-detecting...' % (os.environ['QT_API'],))
 
-qt4_backend = None
-for name, importFunction in preference:
-    try:
-        QtCore = importFunction()
-    except ImportError:
-        continue
-    except AttributeError:
-        continue
-    qt4_backend = name
-    break
-else:
-    raise Exception('Unable to import PyQt4 or PySide. Please install one of these packages first.')
+# Names resolved on first access (PEP 562 module __getattr__) rather than at
+# import: locating and importing a Qt backend takes hundreds of milliseconds
+# and should not be paid by code that uses xmlstore without its GUI.
+_lazynames = frozenset(('QtCore', 'QtGui', 'QtWidgets', 'QtPrintSupport',
+                        'qt4_backend', 'qt4_backend_version', 'mpl_qt4_backend'))
+
+def _initialize():
+    """Detects the Qt backend and imports its modules, binding all lazily
+    exposed names in the module namespace so subsequent attribute access
+    no longer goes through __getattr__.
+    """
+    global QtCore, QtGui, QtWidgets, QtPrintSupport
+    global qt4_backend, qt4_backend_version, mpl_qt4_backend
+
+    qt4_backend = None
+    for name, importFunction in preference:
+        try:
+            QtCore = importFunction()
+        except ImportError:
+            continue
+        except AttributeError:
+            continue
+        qt4_backend = name
+        break
+    else:
+        raise Exception('Unable to import PyQt4 or PySide. Please install one of these packages first.')
+
+    # Store properties describing backend.
+    # Create additional methods in QtCore module where needed.
+    if qt4_backend == 'PySide':
+        import PySide
+        mpl_qt4_backend = 'PySide'
+        qt4_backend_version = PySide.__version__
+    else:
+        mpl_qt4_backend = qt4_backend
+        qt4_backend_version = QtCore.PYQT_VERSION_STR
+
+        QtCore.Signal = QtCore.pyqtSignal
+        QtCore.Slot = QtCore.pyqtSlot
+        QtCore.Property = QtCore.pyqtProperty
+
+    # Import QtGui module and create additional methods where needed.
+    QtGui = importModule('QtGui')
+    if qt4_backend == 'PyQt5':
+        QtWidgets = importModule('QtWidgets')
+        QtPrintSupport = importModule('QtPrintSupport')
+    else:
+        QtWidgets = QtGui
+        QtPrintSupport = QtGui
+    if qt4_backend in ('PySide', 'PyQt5'):
+        QtWidgets.QFileDialog.getOpenFileNamesAndFilter = QtWidgets.QFileDialog.getOpenFileNames
+        QtWidgets.QFileDialog.getOpenFileNameAndFilter = QtWidgets.QFileDialog.getOpenFileName
+        QtWidgets.QFileDialog.getSaveFileNameAndFilter = QtWidgets.QFileDialog.getSaveFileName
 
 def importModule(moduleName):
+    if 'qt4_backend' not in globals(): _initialize()
     qt4 = __import__(qt4_backend, globals(), locals(), [moduleName])
     return getattr(qt4, moduleName)
 
-# Store properties describing backend.
-# Create additional methods in QtCore module where needed.
-if qt4_backend == 'PySide':
-    import PySide
-    mpl_qt4_backend = 'PySide'
-    qt4_backend_version = PySide.__version__
-else:
-    mpl_qt4_backend = qt4_backend
-    qt4_backend_version = QtCore.PYQT_VERSION_STR
-
-    QtCore.Signal = QtCore.pyqtSignal
-    QtCore.Slot = QtCore.pyqtSlot
-    QtCore.Property = QtCore.pyqtProperty
-
-# Import QtGui module and create additional methods where needed.
-QtGui = importModule('QtGui')
-if qt4_backend == 'PyQt5':
-    QtWidgets = importModule('QtWidgets')
-    QtPrintSupport = importModule('QtPrintSupport')
-else:
-    QtWidgets = QtGui
-    QtPrintSupport = QtGui
-if qt4_backend in ('PySide', 'PyQt5'):
-    QtWidgets.QFileDialog.getOpenFileNamesAndFilter = QtWidgets.QFileDialog.getOpenFileNames
-    QtWidgets.QFileDialog.getOpenFileNameAndFilter = QtWidgets.QFileDialog.getOpenFileName
-    QtWidgets.QFileDialog.getSaveFileNameAndFilter = QtWidgets.QFileDialog.getSaveFileName
+def __getattr__(name):
+    if name in _lazynames:
+        _initialize()
+        return globals()[name]
+    raise AttributeError('module %r has no attribute %r' % (__name__, name))
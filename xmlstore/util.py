@@ -100,26 +100,12 @@ class referencedobject(object):
 # Date-time parsing variables and functions
 # ------------------------------------------------------------------------------------------
 
-class UTC(datetime.tzinfo):
-    """Minimal tzinfo class for UTC
-    """
-    ZERO = datetime.timedelta(0)
-
-    def utcoffset(self, dt):
-        return UTC.ZERO
-
-    def tzname(self, dt):
-        return 'UTC'
-
-    def dst(self, dt):
-        return UTC.ZERO
-        
-# Date format used for datetime strings visible to the user.
-utc = None
 def getUTC():
-    global utc
-    if utc is None: utc = UTC()
-    return utc
+    """Returns the UTC time zone object. This is the C-implemented
+    datetime.timezone.utc singleton, which is considerably faster than the
+    pure-Python tzinfo subclass that was used before Python 3.2.
+    """
+    return datetime.timezone.utc
 
 def dateTimeFromTuple(tup):
     """Returns a datetime object from a sequence with six items: year,